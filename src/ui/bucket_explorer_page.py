@@ -2,19 +2,30 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QPushButton, QTableWidget,
                              QTableWidgetItem, QHeaderView, QMessageBox,
                              QFileDialog, QDialog, QPlainTextEdit, QProgressDialog,
-                             QMenu)
-from PyQt6.QtCore import pyqtSignal, Qt
+                             QMenu, QCheckBox, QSpinBox)
+from PyQt6.QtCore import pyqtSignal, Qt, QTimer, QItemSelectionModel
 from PyQt6.QtGui import QPixmap, QImage
 import boto3
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
 import os
 from datetime import datetime
 import tempfile
 import mimetypes
+import heapq
 import json
+from .hex_viewer_dialog import HexViewerDialog
+from .compressed_preview_dialog import CompressedPreviewDialog, compression_for_key, zstandard
+from .navigation_history import NavigationHistory, ViewState
+from .object_listing import ListingWorker, split_filter_query
+from .verified_download import ChecksumMismatchError, download_verified
+from .tabular_preview_dialog import TabularPreviewDialog, tabular_format_for_key
+from .version_browser import VersionBrowser
+from .formatting import format_size
 
 class BucketExplorerPage(QWidget):
     back_to_buckets = pyqtSignal()  # New signal for returning to bucket list
+    history_restored = pyqtSignal()  # History navigation landed on an explorer view
+    compare_requested = pyqtSignal(str, str)  # bucket, prefix
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -28,6 +39,22 @@ class BucketExplorerPage(QWidget):
         self.total_items = 0
         self.sort_column = 0  # Default sort column
         self.sort_order = Qt.SortOrder.AscendingOrder  # Default sort order
+        self.watch_timer = QTimer(self)
+        self.watch_timer.timeout.connect(self.refresh_objects)
+        self.history = NavigationHistory()
+        self.showing_bucket_list = True  # The bucket list is part of the history too
+        self.listing_worker = None
+        self.objects_listed = False  # False while versions mode skips the object listing
+        self.refresh_worker = None
+        self.refresh_listed = []  # Entries collected by the refresh in progress
+        self.refresh_append_only = False
+        self.stale_workers = []  # Cancelled listings that are still winding down
+        self.active_filter = ""
+        # Wait for a pause in typing before listing for a new filter
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.apply_filter)
         self.setup_ui()
     
     def setup_ui(self):
@@ -39,10 +66,22 @@ class BucketExplorerPage(QWidget):
         
         # Back button on the left
         self.back_button = QPushButton("← Back to Buckets")
-        self.back_button.clicked.connect(lambda: self.back_to_buckets.emit())
+        self.back_button.clicked.connect(self.show_bucket_list)
         self.back_button.setMaximumWidth(150)  # Limit width
         top_bar.addWidget(self.back_button)
         
+        # Browser-style history buttons
+        self.history_back_button = QPushButton("◀")
+        self.history_back_button.setToolTip("Back (Alt+Left)")
+        self.history_back_button.setMaximumWidth(40)
+        self.history_back_button.clicked.connect(self.history_back)
+        top_bar.addWidget(self.history_back_button)
+        self.history_forward_button = QPushButton("▶")
+        self.history_forward_button.setToolTip("Forward (Alt+Right)")
+        self.history_forward_button.setMaximumWidth(40)
+        self.history_forward_button.clicked.connect(self.history_forward)
+        top_bar.addWidget(self.history_forward_button)
+        
         # Add some spacing
         top_bar.addSpacing(20)
         
@@ -55,6 +94,41 @@ class BucketExplorerPage(QWidget):
         
         layout.addLayout(top_bar)
         
+        # Name filter
+        self.filter_box = QLineEdit()
+        self.filter_box.setPlaceholderText("Filter by name prefix or glob (e.g. 2024-06- or *.parquet)...")
+        self.filter_box.textChanged.connect(lambda: self.filter_timer.start())
+        layout.addWidget(self.filter_box)
+        
+        # Refresh and live-watch controls
+        refresh_layout = QHBoxLayout()
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh_objects)
+        refresh_layout.addWidget(self.refresh_button)
+        self.watch_checkbox = QCheckBox("Auto-refresh every")
+        self.watch_checkbox.toggled.connect(self.on_watch_toggled)
+        refresh_layout.addWidget(self.watch_checkbox)
+        self.watch_interval = QSpinBox()
+        self.watch_interval.setRange(5, 3600)
+        self.watch_interval.setValue(30)
+        self.watch_interval.setSuffix(" s")
+        self.watch_interval.valueChanged.connect(self.on_watch_toggled)
+        refresh_layout.addWidget(self.watch_interval)
+        self.append_only_checkbox = QCheckBox("Append-only (only list keys after the last one seen)")
+        refresh_layout.addWidget(self.append_only_checkbox)
+        self.versions_checkbox = QCheckBox("Show versions")
+        self.versions_checkbox.toggled.connect(self.on_versions_toggled)
+        refresh_layout.addWidget(self.versions_checkbox)
+        refresh_layout.addStretch()
+        self.refresh_status = QLabel()
+        refresh_layout.addWidget(self.refresh_status)
+        self.compare_button = QPushButton("Compare...")
+        self.compare_button.clicked.connect(
+            lambda: self.compare_requested.emit(self.current_bucket, self.current_prefix)
+        )
+        refresh_layout.addWidget(self.compare_button)
+        layout.addLayout(refresh_layout)
+        
         # Object table
         self.object_table = QTableWidget()
         self.object_table.setColumnCount(4)
@@ -70,6 +144,14 @@ class BucketExplorerPage(QWidget):
         self.object_table.horizontalHeader().sectionClicked.connect(self.on_header_clicked)  # Add sorting
         layout.addWidget(self.object_table)
         
+        # Versions of the same location, shown in place of the object table
+        self.version_browser = VersionBrowser()
+        self.version_browser.folder_opened.connect(self.open_prefix)
+        self.version_browser.preview_requested.connect(self.preview_object)
+        self.version_browser.download_requested.connect(self.save_object)
+        self.version_browser.hide()
+        layout.addWidget(self.version_browser)
+        
         # Pagination controls
         pagination_layout = QHBoxLayout()
         self.prev_button = QPushButton("Previous")
@@ -81,22 +163,36 @@ class BucketExplorerPage(QWidget):
         pagination_layout.addWidget(self.page_info)
         pagination_layout.addWidget(self.next_button)
         pagination_layout.addStretch()
+        self.history_label = QLabel()
+        pagination_layout.addWidget(self.history_label)
         layout.addLayout(pagination_layout)
         
         self.setLayout(layout)
+        self.update_history_controls()
     
     def set_bucket(self, bucket_name):
         """Set the current bucket and load its contents"""
+        self.history.push(self.capture_view_state())
+        self.showing_bucket_list = False
         self.current_bucket = bucket_name
         self.current_prefix = ""
+        self.set_filter_text("")
         self.update_breadcrumb()
         self.load_objects()
+        self.update_history_controls()
     
     def set_session(self, session):
         """Set the AWS session"""
+        # Loading happens in set_bucket, which always follows
         self.s3_client = session.client('s3')
-        if self.current_bucket:
-            self.load_objects()
+    
+    def show_bucket_list(self):
+        """Leave for the bucket list, remembering the current view"""
+        if not self.showing_bucket_list:
+            self.history.push(self.capture_view_state())
+            self.showing_bucket_list = True
+            self.update_history_controls()
+        self.back_to_buckets.emit()
     
     def update_breadcrumb(self):
         """Update the breadcrumb navigation with clickable parts"""
@@ -137,72 +233,393 @@ class BucketExplorerPage(QWidget):
     
     def navigate_to(self, prefix):
         """Navigate to a specific prefix when clicking breadcrumb"""
+        self.open_prefix(prefix)
+    
+    def open_prefix(self, prefix):
+        """Show a prefix, remembering the current view in the history"""
+        self.history.push(self.capture_view_state())
         self.current_prefix = prefix
+        self.set_filter_text("")
+        self.update_breadcrumb()
         self.load_objects()
+        self.update_history_controls()
     
-    def load_objects(self):
-        """Load objects from the current bucket and prefix"""
-        try:
-            # List objects with delimiter for proper folder structure
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.current_bucket,
-                Prefix=self.current_prefix,
-                Delimiter='/'
-            )
-            
-            self.total_objects = []
-            
-            # Add folders (CommonPrefixes)
-            if 'CommonPrefixes' in response:
-                for prefix in response['CommonPrefixes']:
-                    folder_name = prefix['Prefix']
-                    self.total_objects.append({
-                        'Key': folder_name,
-                        'Size': 0,
-                        'LastModified': None,
-                        'ContentType': 'folder',
-                        'is_folder': True
-                    })
-            
-            # Add files
-            if 'Contents' in response:
-                for obj in response['Contents']:
-                    key = obj['Key']
-                    # Skip the current prefix itself
-                    if key != self.current_prefix:
-                        # Get content type
-                        try:
-                            head_response = self.s3_client.head_object(
-                                Bucket=self.current_bucket,
-                                Key=key
-                            )
-                            content_type = head_response.get('ContentType', 'N/A')
-                        except:
-                            content_type = 'N/A'
-                        
-                        self.total_objects.append({
-                            'Key': key,
-                            'Size': obj['Size'],
-                            'LastModified': obj['LastModified'],
-                            'ContentType': content_type,
-                            'is_folder': False
-                        })
-            
-            # Update total items and pages
+    def capture_view_state(self):
+        """Snapshot the current view for the history"""
+        if self.showing_bucket_list:
+            return ViewState()
+        
+        selected_keys = {
+            self.row_key(index.row())
+            for index in self.object_table.selectionModel().selectedRows()
+        }
+        state = ViewState(
+            self.s3_client,
+            self.current_bucket,
+            self.current_prefix,
+            self.total_objects,
+            self.sort_column,
+            self.sort_order,
+            self.current_page,
+            selected_keys,
+            self.object_table.verticalScrollBar().value(),
+            self.active_filter
+        )
+        if self.listing_worker or not self.objects_listed:
+            # A partial or skipped listing would look complete when restored
+            state.drop_objects()
+        return state
+    
+    def restore_view_state(self, state):
+        """Show a view from the history without listing it again"""
+        self.cancel_listing()
+        if state.is_bucket_list():
+            self.showing_bucket_list = True
+            self.update_history_controls()
+            self.back_to_buckets.emit()
+            return
+        
+        self.showing_bucket_list = False
+        self.s3_client = state.s3_client
+        self.current_bucket = state.bucket
+        self.current_prefix = state.prefix
+        self.sort_column = state.sort_column
+        self.sort_order = state.sort_order
+        self.set_filter_text(state.filter_text)
+        self.update_breadcrumb()
+        
+        if state.objects is None:
+            # The listing was dropped to stay under the history memory cap
+            self.load_objects()
+        else:
+            self.total_objects = state.objects
+            self.objects_listed = True
             self.total_items = len(self.total_objects)
             self.total_pages = (self.total_items + self.page_size - 1) // self.page_size
-            self.current_page = 1  # Reset to first page when entering a new folder
-            
-            self.sort_objects()
+            self.current_page = min(state.current_page, max(1, self.total_pages))
             self.update_object_table()
             self.update_pagination_info()
             
-        except ClientError as e:
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"Failed to list objects: {str(e)}"
+            for row in range(self.object_table.rowCount()):
+                if self.row_key(row) in state.selected_keys:
+                    self.object_table.selectionModel().select(
+                        self.object_table.model().index(row, 0),
+                        QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+                    )
+            # The scroll range is only updated once the table has laid out
+            QTimer.singleShot(
+                0,
+                lambda: self.object_table.verticalScrollBar().setValue(state.scroll_value)
             )
+            self.update_version_browser()
+        
+        self.update_history_controls()
+        self.history_restored.emit()
+    
+    def history_back(self):
+        """Step back to the previously visited view"""
+        state = self.history.back(self.capture_view_state())
+        if state:
+            self.restore_view_state(state)
+    
+    def history_forward(self):
+        """Step forward again after going back"""
+        state = self.history.forward(self.capture_view_state())
+        if state:
+            self.restore_view_state(state)
+    
+    def update_history_controls(self):
+        """Enable the history buttons and report retained history memory"""
+        self.history_back_button.setEnabled(self.history.can_go_back())
+        self.history_forward_button.setEnabled(self.history.can_go_forward())
+        self.history_label.setText(
+            f"History: {self.history.entry_count()} views, "
+            f"{format_size(self.history.memory_used())} retained"
+        )
+    
+    def load_objects(self):
+        """Load objects from the current bucket and prefix"""
+        self.cancel_listing()
+        
+        self.total_objects = []
+        self.total_items = 0
+        self.total_pages = 1
+        self.current_page = 1  # Reset to first page when entering a new folder
+        self.update_object_table()
+        self.update_pagination_info()
+        
+        self.active_filter = self.filter_box.text()
+        if self.versions_checkbox.isChecked():
+            # The object table is hidden; it is listed when switched back to
+            self.objects_listed = False
+            self.update_version_browser()
+            return
+        
+        # Pages are streamed in from a background listing so large folders
+        # show up immediately and a newer query can supersede this one
+        self.objects_listed = True
+        name_prefix, matcher = split_filter_query(self.active_filter)
+        worker = ListingWorker(
+            self.s3_client,
+            self.current_bucket,
+            self.current_prefix,
+            name_prefix,
+            matcher
+        )
+        worker.page_ready.connect(lambda objects, w=worker: self.on_listing_page(w, objects))
+        worker.listing_finished.connect(lambda w=worker: self.on_listing_finished(w))
+        worker.failed.connect(lambda message, w=worker: self.on_listing_failed(w, message))
+        self.listing_worker = worker
+        self.refresh_status.setText("Loading...")
+        worker.start()
+    
+    def cancel_listing(self):
+        """Cancel the background listing and refresh, if any are running"""
+        for worker in (self.listing_worker, self.refresh_worker):
+            if worker:
+                worker.cancel()
+                if worker.isRunning():
+                    # Keep a reference until the thread exits
+                    self.stale_workers.append(worker)
+                    worker.finished.connect(lambda w=worker: self.stale_workers.remove(w))
+        self.listing_worker = None
+        self.refresh_worker = None
+    
+    def on_listing_page(self, worker, objects):
+        """Merge a freshly listed page into the view"""
+        if worker is not self.listing_worker:
+            return  # Superseded by a newer listing
+        
+        # Only the new page is sorted; merging it into the already sorted
+        # entries keeps each page linear instead of re-sorting everything
+        sort_key = self.sort_key()
+        reverse = self.sort_order == Qt.SortOrder.DescendingOrder
+        objects = sorted(objects, key=sort_key, reverse=reverse)
+        if objects and self.total_objects:
+            last, first = sort_key(self.total_objects[-1]), sort_key(objects[0])
+            if (first <= last) if reverse else (first >= last):
+                # Pages usually continue where the last one ended
+                self.total_objects.extend(objects)
+            else:
+                self.total_objects = list(
+                    heapq.merge(self.total_objects, objects, key=sort_key, reverse=reverse)
+                )
+        else:
+            self.total_objects.extend(objects)
+        self.total_items = len(self.total_objects)
+        self.total_pages = max(1, (self.total_items + self.page_size - 1) // self.page_size)
+        
+        self.apply_row_changes(set())
+        self.update_pagination_info()
+        self.refresh_status.setText(f"Loading... {self.total_items} items")
+    
+    def on_listing_finished(self, worker):
+        """Handle the end of the background listing"""
+        if worker is not self.listing_worker:
+            return
+        self.listing_worker = None
+        self.refresh_status.setText(f"Loaded {self.total_items} items")
+    
+    def on_listing_failed(self, worker, message):
+        """Report a failed background listing"""
+        if worker is not self.listing_worker:
+            return
+        self.listing_worker = None
+        self.refresh_status.setText("")
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to list objects: {message}"
+        )
+    
+    def apply_filter(self):
+        """List again for the filter text once typing has settled"""
+        if self.current_bucket and self.filter_box.text() != self.active_filter:
+            self.load_objects()
+    
+    def set_filter_text(self, text):
+        """Change the filter box without triggering a new listing"""
+        self.filter_timer.stop()
+        self.filter_box.blockSignals(True)
+        self.filter_box.setText(text)
+        self.filter_box.blockSignals(False)
+        self.active_filter = text
+    
+    def refresh_objects(self):
+        """Re-list the current prefix in the background to update the view"""
+        if not self.s3_client or not self.current_bucket or not self.isVisible():
+            return
+        if self.versions_checkbox.isChecked() or not self.objects_listed:
+            return  # The object table is hidden; the version browser has its own Reload
+        if self.listing_worker or self.refresh_worker:
+            return  # The listing in progress is already fresh
+        
+        displayed = {obj['Key']: obj for obj in self.total_objects}
+        name_prefix, matcher = split_filter_query(self.active_filter)
+        self.refresh_append_only = self.append_only_checkbox.isChecked()
+        # Keys only ever get added after the last one in append-only mode, so
+        # a single small LIST starting after it finds everything new
+        start_after = max(displayed, default=None) if self.refresh_append_only else None
+        worker = ListingWorker(
+            self.s3_client,
+            self.current_bucket,
+            self.current_prefix,
+            name_prefix,
+            matcher,
+            start_after,
+            displayed
+        )
+        worker.page_ready.connect(lambda objects, w=worker: self.on_refresh_page(w, objects))
+        worker.listing_finished.connect(lambda w=worker: self.on_refresh_finished(w))
+        worker.failed.connect(lambda message, w=worker: self.on_refresh_failed(w, message))
+        self.refresh_worker = worker
+        self.refresh_listed = []
+        self.refresh_status.setText("Refreshing...")
+        worker.start()
+    
+    def on_refresh_page(self, worker, objects):
+        """Collect a page of the refresh listing"""
+        if worker is self.refresh_worker:
+            self.refresh_listed.extend(objects)
+    
+    def on_refresh_failed(self, worker, message):
+        """Report a failed refresh without interrupting the user"""
+        if worker is not self.refresh_worker:
+            return
+        self.refresh_worker = None
+        self.refresh_status.setText(f"Refresh failed: {message}")
+    
+    def on_refresh_finished(self, worker):
+        """Apply only the differences found by the refresh to the view"""
+        if worker is not self.refresh_worker:
+            return
+        self.refresh_worker = None
+        
+        displayed = {obj['Key']: obj for obj in self.total_objects}
+        if self.refresh_append_only:
+            listed = dict(displayed)
+        else:
+            listed = {}
+        for obj in self.refresh_listed:
+            listed[obj['Key']] = obj
+        self.refresh_listed = []
+        
+        inserted = [key for key in listed if key not in displayed]
+        deleted = [key for key in displayed if key not in listed]
+        updated = {
+            key for key in listed
+            if key in displayed and self.object_changed(displayed[key], listed[key])
+        }
+        
+        self.refresh_status.setText(
+            f"Refreshed {datetime.now().strftime('%H:%M:%S')}: "
+            f"{len(inserted)} added, {len(deleted)} removed, {len(updated)} changed"
+        )
+        if not (inserted or deleted or updated):
+            return
+        
+        # Keep the existing order so the sort below only has to place new entries
+        self.total_objects = [
+            listed[obj['Key']] for obj in self.total_objects if obj['Key'] in listed
+        ] + [listed[key] for key in inserted]
+        self.total_items = len(self.total_objects)
+        self.total_pages = (self.total_items + self.page_size - 1) // self.page_size
+        self.current_page = min(self.current_page, max(1, self.total_pages))
+        
+        self.sort_objects(update_view=False)
+        self.apply_row_changes(updated)
+        self.update_pagination_info()
+    
+    def object_changed(self, old, new):
+        """Check whether a listed object differs from the displayed one"""
+        return (
+            old['ETag'] != new['ETag']
+            or old['Size'] != new['Size']
+            or old['LastModified'] != new['LastModified']
+        )
+    
+    def apply_row_changes(self, updated_keys):
+        """Bring the table in line with the current page using row inserts and removals
+
+        Selection and scroll position are kept for rows that stay on the page.
+        """
+        start_idx = (self.current_page - 1) * self.page_size
+        page_objects = self.total_objects[start_idx:start_idx + self.page_size]
+        page_keys = {obj['Key'] for obj in page_objects}
+        
+        selected_keys = {
+            self.row_key(index.row())
+            for index in self.object_table.selectionModel().selectedRows()
+        }
+        scroll_value = self.object_table.verticalScrollBar().value()
+        
+        # Remove rows that left this page or whose contents changed
+        for row in reversed(range(self.object_table.rowCount())):
+            key = self.row_key(row)
+            if key not in page_keys or key in updated_keys:
+                self.object_table.removeRow(row)
+        
+        # The remaining rows are already in sorted order, so walking the page
+        # and inserting wherever the keys disagree restores the full page
+        for i, obj in enumerate(page_objects):
+            if i < self.object_table.rowCount() and self.row_key(i) == obj['Key']:
+                continue
+            self.object_table.insertRow(i)
+            self.set_object_row(i, obj)
+            if obj['Key'] in selected_keys:
+                self.object_table.selectionModel().select(
+                    self.object_table.model().index(i, 0),
+                    QItemSelectionModel.SelectionFlag.Select | QItemSelectionModel.SelectionFlag.Rows
+                )
+        
+        self.object_table.verticalScrollBar().setValue(scroll_value)
+    
+    def row_key(self, row):
+        """Return the S3 key shown in a table row"""
+        return self.object_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
+    
+    def object_at_row(self, row):
+        """Return the object shown in a table row of the current page"""
+        return self.total_objects[(self.current_page - 1) * self.page_size + row]
+    
+    def on_watch_toggled(self):
+        """Start or stop periodic refreshing of the current prefix"""
+        if self.watch_checkbox.isChecked():
+            self.watch_timer.start(self.watch_interval.value() * 1000)
+        else:
+            self.watch_timer.stop()
+    
+    def on_versions_toggled(self):
+        """Switch between the object table and the version browser"""
+        showing_versions = self.versions_checkbox.isChecked()
+        self.object_table.setVisible(not showing_versions)
+        self.prev_button.setVisible(not showing_versions)
+        self.next_button.setVisible(not showing_versions)
+        self.page_info.setVisible(not showing_versions)
+        self.version_browser.setVisible(showing_versions)
+        if showing_versions:
+            if self.listing_worker:
+                # Stop listing (and HEADing) objects for a table nobody sees
+                self.cancel_listing()
+                self.objects_listed = False
+                self.refresh_status.setText("")
+            self.update_version_browser()
+        else:
+            self.version_browser.stop()
+            if not self.objects_listed and self.current_bucket:
+                self.load_objects()
+    
+    def update_version_browser(self):
+        """Point the version browser at the current location, if it is shown"""
+        if not self.versions_checkbox.isChecked() or not self.current_bucket:
+            return
+        name_prefix, _ = split_filter_query(self.active_filter)
+        self.version_browser.set_location(
+            self.s3_client,
+            self.current_bucket,
+            self.current_prefix,
+            name_prefix
+        )
     
     def update_object_table(self):
         """Update the object table with current page data"""
@@ -212,43 +629,41 @@ class BucketExplorerPage(QWidget):
         
         self.object_table.setRowCount(len(current_objects))
         for i, obj in enumerate(current_objects):
-            # Name column
-            name = obj['Key'][len(self.current_prefix):].rstrip('/')
-            if obj['is_folder']:
-                name = f"📁 {name}"
-            else:
-                name = f"📄 {name}"
-            self.object_table.setItem(i, 0, QTableWidgetItem(name))
-            
-            # Size column
-            if obj['Size']:
-                size = self.format_size(obj['Size'])
-            else:
-                size = ""
-            self.object_table.setItem(i, 1, QTableWidgetItem(size))
-            
-            # Last Modified column
-            if obj['LastModified']:
-                modified = obj['LastModified'].strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                modified = ""
-            self.object_table.setItem(i, 2, QTableWidgetItem(modified))
-            
-            # Content Type column
-            content_type = obj['ContentType']
-            self.object_table.setItem(i, 3, QTableWidgetItem(content_type))
+            self.set_object_row(i, obj)
         
         # Update pagination buttons
         self.prev_button.setEnabled(self.current_page > 1)
         self.next_button.setEnabled(end_idx < len(self.total_objects))
     
-    def format_size(self, size_bytes):
-        """Format file size in human-readable format"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+    def set_object_row(self, row, obj):
+        """Fill one table row with an object's details"""
+        # Name column
+        name = obj['Key'][len(self.current_prefix):].rstrip('/')
+        if obj['is_folder']:
+            name = f"📁 {name}"
+        else:
+            name = f"📄 {name}"
+        name_item = QTableWidgetItem(name)
+        name_item.setData(Qt.ItemDataRole.UserRole, obj['Key'])
+        self.object_table.setItem(row, 0, name_item)
+        
+        # Size column
+        if obj['Size']:
+            size = format_size(obj['Size'])
+        else:
+            size = ""
+        self.object_table.setItem(row, 1, QTableWidgetItem(size))
+        
+        # Last Modified column
+        if obj['LastModified']:
+            modified = obj['LastModified'].strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            modified = ""
+        self.object_table.setItem(row, 2, QTableWidgetItem(modified))
+        
+        # Content Type column
+        content_type = obj['ContentType']
+        self.object_table.setItem(row, 3, QTableWidgetItem(content_type))
     
     def show_context_menu(self, position):
         """Show context menu for right-click actions"""
@@ -257,7 +672,7 @@ class BucketExplorerPage(QWidget):
         
         if selected_items:
             row = selected_items[0].row()
-            obj = self.total_objects[row]
+            obj = self.object_at_row(row)
             
             if obj['is_folder']:
                 download_action = menu.addAction("Download Folder")
@@ -265,6 +680,8 @@ class BucketExplorerPage(QWidget):
             else:
                 download_action = menu.addAction("Download")
                 download_action.triggered.connect(self.download_file)
+                hex_action = menu.addAction("View as Hex")
+                hex_action.triggered.connect(lambda: self.show_hex_viewer(obj))
         
         menu.exec(self.object_table.viewport().mapToGlobal(position))
     
@@ -275,11 +692,15 @@ class BucketExplorerPage(QWidget):
             return
         
         row = selected_items[0].row()
-        obj = self.total_objects[row]
+        obj = self.object_at_row(row)
         
         if obj['is_folder']:
             return
         
+        self.save_object(obj)
+    
+    def save_object(self, obj):
+        """Ask for a location and download one object (or one version of it)"""
         # Get save location from user
         file_name = obj['Key'].split('/')[-1]
         save_path, _ = QFileDialog.getSaveFileName(
@@ -290,17 +711,30 @@ class BucketExplorerPage(QWidget):
         
         if save_path:
             try:
-                self.s3_client.download_file(
+                verified = download_verified(
+                    self.s3_client,
                     self.current_bucket,
                     obj['Key'],
-                    save_path
+                    save_path,
+                    obj.get('VersionId')
                 )
+                if verified:
+                    check_text = f"Verified with {', '.join(verified)}."
+                else:
+                    check_text = "The object has no checksum that could be verified."
                 QMessageBox.information(
                     self,
                     "Success",
-                    f"File downloaded successfully to {save_path}"
+                    f"File downloaded successfully to {save_path}\n{check_text}"
                 )
-            except ClientError as e:
+            except ChecksumMismatchError as e:
+                QMessageBox.critical(
+                    self,
+                    "Checksum Mismatch",
+                    f"Downloaded data did not match the object after retrying, "
+                    f"so the file was not saved: {str(e)}"
+                )
+            except (ClientError, BotoCoreError, OSError) as e:
                 QMessageBox.critical(
                     self,
                     "Error",
@@ -319,7 +753,7 @@ class BucketExplorerPage(QWidget):
             return
         
         row = selected_items[0].row()
-        obj = self.total_objects[row]
+        obj = self.object_at_row(row)
         
         if not obj['is_folder']:
             QMessageBox.warning(
@@ -369,6 +803,8 @@ class BucketExplorerPage(QWidget):
                 os.makedirs(base_folder, exist_ok=True)
                 
                 # Download each object
+                mismatches = []
+                unverified = 0
                 for i, s3_obj in enumerate(all_objects):
                     if progress.wasCanceled():
                         break
@@ -377,6 +813,10 @@ class BucketExplorerPage(QWidget):
                     progress.setValue(int((i / total_objects) * 100))
                     progress.setLabelText(f"Downloading {s3_obj['Key']}...")
                     
+                    # Skip folder marker objects
+                    if s3_obj['Key'].endswith('/'):
+                        continue
+                    
                     # Create local path (preserving folder structure)
                     rel_path = s3_obj['Key'][len(folder_prefix):]  # Get path relative to folder
                     local_path = os.path.join(base_folder, rel_path.lstrip('/'))
@@ -384,21 +824,37 @@ class BucketExplorerPage(QWidget):
                     # Create directory if needed
                     os.makedirs(os.path.dirname(local_path), exist_ok=True)
                     
-                    # Download file
-                    self.s3_client.download_file(
-                        self.current_bucket,
-                        s3_obj['Key'],
-                        local_path
-                    )
+                    # Download file, verifying it as it is written
+                    try:
+                        if not download_verified(
+                            self.s3_client,
+                            self.current_bucket,
+                            s3_obj['Key'],
+                            local_path
+                        ):
+                            unverified += 1
+                    except ChecksumMismatchError as e:
+                        mismatches.append(str(e))
                 
                 progress.setValue(100)
                 
-                QMessageBox.information(
-                    self,
-                    "Success",
-                    f"Folder downloaded successfully to {base_folder}"
-                )
-            except ClientError as e:
+                if mismatches:
+                    QMessageBox.warning(
+                        self,
+                        "Checksum Mismatch",
+                        f"{len(mismatches)} file(s) did not match after retrying and were not saved:\n"
+                        + "\n".join(mismatches[:20])
+                    )
+                else:
+                    message = f"Folder downloaded successfully to {base_folder}"
+                    if unverified:
+                        message += f"\n{unverified} file(s) had no checksum that could be verified."
+                    QMessageBox.information(
+                        self,
+                        "Success",
+                        message
+                    )
+            except (ClientError, BotoCoreError, OSError) as e:
                 QMessageBox.critical(
                     self,
                     "Error",
@@ -414,33 +870,32 @@ class BucketExplorerPage(QWidget):
     def go_back(self):
         """Go back to parent folder"""
         if self.current_prefix:
-            self.current_prefix = os.path.dirname(self.current_prefix.rstrip('/'))
-            if self.current_prefix:
-                self.current_prefix += '/'
-            self.update_breadcrumb()
-            self.load_objects()
+            parent_prefix = os.path.dirname(self.current_prefix.rstrip('/'))
+            if parent_prefix:
+                parent_prefix += '/'
+            self.open_prefix(parent_prefix)
     
     def previous_page(self):
         """Go to previous page"""
         if self.current_page > 1:
             self.current_page -= 1
-            self.load_objects()
+            self.update_object_table()
+            self.update_pagination_info()
     
     def next_page(self):
         """Go to next page"""
         if (self.current_page * self.page_size) < len(self.total_objects):
             self.current_page += 1
-            self.load_objects()
+            self.update_object_table()
+            self.update_pagination_info()
     
     def on_object_double_clicked(self, item):
         """Handle object selection"""
         row = item.row()
-        obj = self.total_objects[row]
+        obj = self.object_at_row(row)
         
         if obj['is_folder']:
-            self.current_prefix = obj['Key']
-            self.update_breadcrumb()
-            self.load_objects()
+            self.open_prefix(obj['Key'])
         else:
             self.preview_object(obj)
     
@@ -450,12 +905,36 @@ class BucketExplorerPage(QWidget):
         file_name = obj['Key']
         mime_type, _ = mimetypes.guess_type(file_name)
         
-        if not mime_type:
-            QMessageBox.information(
-                self,
-                "Preview Unavailable",
-                "Preview is not available for this file type."
+        # Compressed objects are decompressed while streaming instead of
+        # being downloaded in full
+        compression = compression_for_key(file_name)
+        if compression:
+            self.show_compressed_preview(obj, compression)
+            return
+        
+        # Data files are previewed from ranged reads of the parts we need
+        tabular_format = tabular_format_for_key(file_name)
+        if tabular_format:
+            preview_dialog = TabularPreviewDialog(
+                self.s3_client,
+                self.current_bucket,
+                obj['Key'],
+                obj['Size'],
+                tabular_format,
+                obj.get('VersionId'),
+                self
             )
+            preview_dialog.exec()
+            return
+        
+        # Anything we cannot render natively goes to the hex viewer, which
+        # only fetches the byte ranges that are on screen
+        if not mime_type or not (
+            mime_type.startswith('image/')
+            or mime_type.startswith('text/')
+            or mime_type in ['application/pdf', 'application/json']
+        ):
+            self.show_hex_viewer(obj)
             return
         
         temp_file = None
@@ -467,7 +946,8 @@ class BucketExplorerPage(QWidget):
             self.s3_client.download_file(
                 self.current_bucket,
                 obj['Key'],
-                temp_file.name
+                temp_file.name,
+                ExtraArgs={'VersionId': obj['VersionId']} if obj.get('VersionId') else None
             )
             
             # Create preview dialog
@@ -507,23 +987,11 @@ class BucketExplorerPage(QWidget):
                         text_edit.setReadOnly(True)
                         dialog_layout.addWidget(text_edit)
                 except UnicodeDecodeError:
-                    QMessageBox.warning(
-                        self,
-                        "Preview Error",
-                        "Unable to preview this text file. It might be binary or encoded."
-                    )
+                    # Binary content behind a text extension
                     preview_dialog.close()
+                    self.show_hex_viewer(obj)
                     return
             
-            else:
-                QMessageBox.information(
-                    self,
-                    "Preview Unavailable",
-                    "Preview is not available for this file type."
-                )
-                preview_dialog.close()
-                return
-            
             # Add close button
             close_btn = QPushButton("Close")
             close_btn.clicked.connect(preview_dialog.close)
@@ -546,6 +1014,39 @@ class BucketExplorerPage(QWidget):
                 except:
                     pass
     
+    def show_hex_viewer(self, obj):
+        """Open the hex viewer for an object without downloading it"""
+        hex_dialog = HexViewerDialog(
+            self.s3_client,
+            self.current_bucket,
+            obj['Key'],
+            obj['Size'],
+            obj.get('VersionId'),
+            self
+        )
+        hex_dialog.exec()
+    
+    def show_compressed_preview(self, obj, compression):
+        """Open the streaming decompression preview for an object"""
+        if compression == 'zstd' and zstandard is None:
+            QMessageBox.information(
+                self,
+                "Preview Unavailable",
+                "Previewing .zst files requires the 'zstandard' package (pip install zstandard)."
+            )
+            return
+        
+        preview_dialog = CompressedPreviewDialog(
+            self.s3_client,
+            self.current_bucket,
+            obj['Key'],
+            obj['Size'],
+            compression,
+            obj.get('VersionId'),
+            self
+        )
+        preview_dialog.exec()
+    
     def on_header_clicked(self, column):
         """Handle column header click for sorting"""
         if column == self.sort_column:
@@ -559,30 +1060,21 @@ class BucketExplorerPage(QWidget):
         self.sort_objects()
         self.update_object_table()
     
-    def sort_objects(self):
-        """Sort objects based on current column and order"""
-        reverse = self.sort_order == Qt.SortOrder.DescendingOrder
-        
-        if self.sort_column == 0:  # Name
-            self.total_objects.sort(
-                key=lambda x: x['Key'].lower(),
-                reverse=reverse
-            )
-        elif self.sort_column == 1:  # Size
-            self.total_objects.sort(
-                key=lambda x: x['Size'],
-                reverse=reverse
-            )
+    def sort_key(self):
+        """Return the sort key function for the current sort column"""
+        if self.sort_column == 1:  # Size
+            return lambda x: x['Size']
         elif self.sort_column == 2:  # Last Modified
-            self.total_objects.sort(
-                key=lambda x: x['LastModified'].timestamp() if x['LastModified'] else 0,
-                reverse=reverse
-            )
+            return lambda x: x['LastModified'].timestamp() if x['LastModified'] else 0
         elif self.sort_column == 3:  # Content Type
-            self.total_objects.sort(
-                key=lambda x: x['ContentType'].lower(),
-                reverse=reverse
-            )
+            return lambda x: x['ContentType'].lower()
+        return lambda x: x['Key'].lower()  # Name
+    
+    def sort_objects(self, update_view=True):
+        """Sort objects based on current column and order"""
+        reverse = self.sort_order == Qt.SortOrder.DescendingOrder
+        self.total_objects.sort(key=self.sort_key(), reverse=reverse)
 
-        self.update_object_table()
-        self.update_pagination_info() 
\ No newline at end of file
+        if update_view:
+            self.update_object_table()
+            self.update_pagination_info() 
\ No newline at end of file
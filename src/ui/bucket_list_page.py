@@ -7,6 +7,7 @@ from botocore.exceptions import ClientError
 
 class BucketListPage(QWidget):
     bucket_selected = pyqtSignal(str)
+    compare_requested = pyqtSignal()
     
     def __init__(self):
         super().__init__()
@@ -29,6 +30,11 @@ class BucketListPage(QWidget):
         self.search_box.textChanged.connect(self.filter_buckets)
         header_layout.addWidget(self.search_box)
         
+        # Compare two buckets/prefixes
+        compare_btn = QPushButton("Compare...")
+        compare_btn.clicked.connect(lambda: self.compare_requested.emit())
+        header_layout.addWidget(compare_btn)
+        
         layout.addLayout(header_layout)
         
         # Bucket table
@@ -0,0 +1,450 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
+                             QLabel, QLineEdit, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QMessageBox,
+                             QFileDialog, QComboBox, QCheckBox)
+from PyQt6.QtCore import pyqtSignal, QThread
+import boto3
+import csv
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from .formatting import format_size
+
+
+class ListingProducer(threading.Thread):
+    """Pages through one side of a comparison into a small bounded queue
+
+    The queue only ever holds a few pages, so a fast side waits for the
+    slower one instead of buffering its whole listing.
+    """
+
+    def __init__(self, s3_client, bucket, prefix, stop_event, max_pages=4):
+        super().__init__(daemon=True)
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.stop_event = stop_event
+        self.pages = queue.Queue(maxsize=max_pages)
+
+    def run(self):
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for response in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+                entries = [
+                    (obj['Key'][len(self.prefix):], obj['Size'], obj.get('ETag'))
+                    for obj in response.get('Contents', [])
+                ]
+                if not self.put(entries):
+                    return
+            self.put(None)
+        except Exception as e:
+            self.put(e)
+
+    def put(self, item):
+        """Queue an item, giving up if the comparison is stopped"""
+        while not self.stop_event.is_set():
+            try:
+                self.pages.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def entries(self):
+        """Iterate over (relative key, size, etag) entries in key order"""
+        while True:
+            try:
+                item = self.pages.get(timeout=0.2)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return
+                continue
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield from item
+
+
+def merge_join(left, right, compare_etags=True):
+    """Merge-join two key-ordered listings
+
+    Yields (status, key, left_entry, right_entry) where status is one of
+    'same', 'changed', 'only_left' or 'only_right'. S3 lists keys in UTF-8
+    byte order, which matches Python's string ordering, so both inputs can
+    be consumed in a single forward pass.
+    """
+    left_iter = iter(left)
+    right_iter = iter(right)
+    left_entry = next(left_iter, None)
+    right_entry = next(right_iter, None)
+
+    while left_entry is not None or right_entry is not None:
+        if right_entry is None or (left_entry is not None and left_entry[0] < right_entry[0]):
+            yield 'only_left', left_entry[0], left_entry, None
+            left_entry = next(left_iter, None)
+        elif left_entry is None or right_entry[0] < left_entry[0]:
+            yield 'only_right', right_entry[0], None, right_entry
+            right_entry = next(right_iter, None)
+        else:
+            changed = (
+                left_entry[1] != right_entry[1]
+                or (compare_etags and left_entry[2] != right_entry[2])
+            )
+            yield ('changed' if changed else 'same'), left_entry[0], left_entry, right_entry
+            left_entry = next(left_iter, None)
+            right_entry = next(right_iter, None)
+
+
+class CompareWorker(QThread):
+    """Runs both listings concurrently and merge-joins them as pages arrive
+
+    Differences are appended to a JSON lines spool file so any number of
+    them can be exported later without being held in memory.
+    """
+
+    diffs_ready = pyqtSignal(object)
+    progress = pyqtSignal(object)
+    compare_finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    BATCH_SIZE = 500
+    EMIT_INTERVAL = 0.25  # seconds
+
+    def __init__(self, left, right, compare_etags, spool_path):
+        super().__init__()
+        self.left = left  # (s3_client, bucket, prefix)
+        self.right = right
+        self.compare_etags = compare_etags
+        self.spool_path = spool_path
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        """Stop listing and merging"""
+        self.stop_event.set()
+
+    def run(self):
+        totals = {
+            'left': 0, 'right': 0, 'same': 0,
+            'changed': 0, 'only_left': 0, 'only_right': 0,
+        }
+        left_producer = ListingProducer(*self.left, self.stop_event)
+        right_producer = ListingProducer(*self.right, self.stop_event)
+        left_producer.start()
+        right_producer.start()
+
+        batch = []
+        last_emit = time.monotonic()
+        try:
+            with open(self.spool_path, 'w', encoding='utf-8') as spool:
+                for status, key, left_entry, right_entry in merge_join(
+                    left_producer.entries(),
+                    right_producer.entries(),
+                    self.compare_etags
+                ):
+                    if self.stop_event.is_set():
+                        break
+
+                    totals[status] += 1
+                    totals['left'] += left_entry is not None
+                    totals['right'] += right_entry is not None
+
+                    if status != 'same':
+                        diff = {
+                            'status': status,
+                            'key': key,
+                            'left_size': left_entry[1] if left_entry else None,
+                            'right_size': right_entry[1] if right_entry else None,
+                            'left_etag': left_entry[2] if left_entry else None,
+                            'right_etag': right_entry[2] if right_entry else None,
+                        }
+                        spool.write(json.dumps(diff) + "\n")
+                        batch.append(diff)
+
+                    now = time.monotonic()
+                    if len(batch) >= self.BATCH_SIZE or now - last_emit >= self.EMIT_INTERVAL:
+                        self.diffs_ready.emit(batch)
+                        self.progress.emit(dict(totals))
+                        batch = []
+                        last_emit = now
+
+            if not self.stop_event.is_set():
+                self.diffs_ready.emit(batch)
+                self.compare_finished.emit(totals)
+        except Exception as e:
+            if not self.stop_event.is_set():
+                self.failed.emit(str(e))
+        finally:
+            self.stop_event.set()
+
+
+class ComparePage(QWidget):
+    back_requested = pyqtSignal()
+
+    # Only this many differences are shown; all of them can be exported
+    MAX_TABLE_ROWS = 10000
+
+    def __init__(self):
+        super().__init__()
+        self.worker = None
+        self.spool_path = None
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Header
+        header_layout = QHBoxLayout()
+        back_button = QPushButton("← Back")
+        back_button.setMaximumWidth(150)
+        back_button.clicked.connect(self.go_back)
+        header_layout.addWidget(back_button)
+        title = QLabel("Compare Listings")
+        title.setStyleSheet("font-size: 24px; font-weight: bold;")
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+        layout.addLayout(header_layout)
+
+        # Left and right locations
+        form = QGridLayout()
+        form.addWidget(QLabel("Profile"), 0, 1)
+        form.addWidget(QLabel("Bucket"), 0, 2)
+        form.addWidget(QLabel("Prefix"), 0, 3)
+        self.left_profile, self.left_bucket, self.left_prefix = self.add_location_row(form, 1, "Left")
+        self.right_profile, self.right_bucket, self.right_prefix = self.add_location_row(form, 2, "Right")
+        layout.addLayout(form)
+
+        # Controls
+        controls = QHBoxLayout()
+        self.etag_checkbox = QCheckBox("Compare ETags (multipart and single-part copies of the same data differ)")
+        self.etag_checkbox.setChecked(True)
+        controls.addWidget(self.etag_checkbox)
+        controls.addStretch()
+        self.start_button = QPushButton("Compare")
+        self.start_button.clicked.connect(self.start_compare)
+        controls.addWidget(self.start_button)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.clicked.connect(self.stop_compare)
+        self.stop_button.setEnabled(False)
+        controls.addWidget(self.stop_button)
+        self.export_button = QPushButton("Export Differences...")
+        self.export_button.clicked.connect(self.export_differences)
+        self.export_button.setEnabled(False)
+        controls.addWidget(self.export_button)
+        layout.addLayout(controls)
+
+        # Differences table
+        self.diff_table = QTableWidget()
+        self.diff_table.setColumnCount(6)
+        self.diff_table.setHorizontalHeaderLabels(
+            ["Status", "Key", "Left Size", "Right Size", "Left ETag", "Right ETag"]
+        )
+        self.diff_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.diff_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        layout.addWidget(self.diff_table)
+
+        self.totals_label = QLabel()
+        layout.addWidget(self.totals_label)
+
+        self.setLayout(layout)
+
+    def add_location_row(self, form, row, label):
+        """Add profile/bucket/prefix inputs for one side"""
+        form.addWidget(QLabel(label), row, 0)
+        profile_combo = QComboBox()
+        profile_combo.addItems(boto3.Session().available_profiles)
+        form.addWidget(profile_combo, row, 1)
+        bucket_input = QLineEdit()
+        form.addWidget(bucket_input, row, 2)
+        prefix_input = QLineEdit()
+        prefix_input.setPlaceholderText("optional, e.g. backups/2024/")
+        form.addWidget(prefix_input, row, 3)
+        return profile_combo, bucket_input, prefix_input
+
+    def prepare(self, profile_name=None, bucket="", prefix=""):
+        """Pre-fill the left side (and the right profile) before showing the page"""
+        if profile_name:
+            self.left_profile.setCurrentText(profile_name)
+            self.right_profile.setCurrentText(profile_name)
+        if bucket:
+            self.left_bucket.setText(bucket)
+            self.left_prefix.setText(prefix)
+
+    def start_compare(self):
+        """Start comparing the two locations"""
+        if not self.left_bucket.text() or not self.right_bucket.text():
+            QMessageBox.warning(
+                self,
+                "Missing Bucket",
+                "Please enter a bucket for both sides."
+            )
+            return
+
+        self.stop_compare()
+        self.remove_spool()
+
+        try:
+            left_client = boto3.Session(profile_name=self.left_profile.currentText() or None).client('s3')
+            right_client = boto3.Session(profile_name=self.right_profile.currentText() or None).client('s3')
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Failed to load AWS profile: {str(e)}"
+            )
+            return
+
+        spool_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jsonl')
+        spool_file.close()
+        self.spool_path = spool_file.name
+
+        self.diff_table.setRowCount(0)
+        self.totals_label.setText("Comparing...")
+        worker = CompareWorker(
+            (left_client, self.left_bucket.text(), self.left_prefix.text()),
+            (right_client, self.right_bucket.text(), self.right_prefix.text()),
+            self.etag_checkbox.isChecked(),
+            self.spool_path
+        )
+        # Signals from a stopped worker may still be queued, so every handler
+        # checks that it comes from the current one
+        worker.diffs_ready.connect(lambda diffs, w=worker: self.on_diffs_ready(w, diffs))
+        worker.progress.connect(lambda totals, w=worker: self.on_progress(w, totals))
+        worker.compare_finished.connect(lambda totals, w=worker: self.on_compare_finished(w, totals))
+        worker.failed.connect(lambda message, w=worker: self.on_failed(w, message))
+        self.worker = worker
+        self.start_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.export_button.setEnabled(False)
+        worker.start()
+
+    def stop_compare(self):
+        """Stop a running comparison"""
+        if self.worker:
+            self.worker.stop()
+            self.worker.wait()
+            self.worker = None
+        self.start_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.export_button.setEnabled(self.spool_path is not None)
+
+    def on_diffs_ready(self, worker, diffs):
+        """Append newly found differences, up to the display cap"""
+        if worker is not self.worker:
+            return
+        row = self.diff_table.rowCount()
+        diffs = diffs[:max(0, self.MAX_TABLE_ROWS - row)]
+        self.diff_table.setRowCount(row + len(diffs))
+        for diff in diffs:
+            values = [
+                diff['status'].replace('_', ' '),
+                diff['key'],
+                format_size(diff['left_size']) if diff['left_size'] is not None else "",
+                format_size(diff['right_size']) if diff['right_size'] is not None else "",
+                diff['left_etag'] or "",
+                diff['right_etag'] or "",
+            ]
+            for column, value in enumerate(values):
+                self.diff_table.setItem(row, column, QTableWidgetItem(value))
+            row += 1
+
+    def on_progress(self, worker, totals):
+        """Show running totals"""
+        if worker is not self.worker:
+            return
+        self.totals_label.setText(self.format_totals(totals, "Comparing..."))
+
+    def on_compare_finished(self, worker, totals):
+        """Show final totals"""
+        if worker is not self.worker:
+            return
+        self.totals_label.setText(self.format_totals(totals, "Done."))
+        self.stop_compare()
+
+    def on_failed(self, worker, message):
+        """Report a failed comparison"""
+        if worker is not self.worker:
+            return
+        self.stop_compare()
+        self.totals_label.setText("Comparison failed.")
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to compare listings: {message}"
+        )
+
+    def format_totals(self, totals, state):
+        """Summarize comparison totals"""
+        differences = totals['changed'] + totals['only_left'] + totals['only_right']
+        text = (
+            f"{state} Left: {totals['left']} keys, right: {totals['right']} keys. "
+            f"Same: {totals['same']}, changed: {totals['changed']}, "
+            f"only left: {totals['only_left']}, only right: {totals['only_right']}."
+        )
+        if differences > self.MAX_TABLE_ROWS:
+            text += f" Showing the first {self.MAX_TABLE_ROWS} differences; export to see all."
+        return text
+
+    def export_differences(self):
+        """Export all differences as CSV or JSON lines"""
+        if not self.spool_path:
+            return
+
+        save_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Differences",
+            "differences.csv",
+            "CSV (*.csv);;JSON Lines (*.jsonl)"
+        )
+        if not save_path:
+            return
+
+        try:
+            if selected_filter.startswith("JSON") or save_path.endswith('.jsonl'):
+                shutil.copyfile(self.spool_path, save_path)
+            else:
+                # Convert line by line so the export never loads every difference
+                fields = ['status', 'key', 'left_size', 'right_size', 'left_etag', 'right_etag']
+                with open(self.spool_path, 'r', encoding='utf-8') as spool, \
+                        open(save_path, 'w', encoding='utf-8', newline='') as out:
+                    writer = csv.DictWriter(out, fieldnames=fields)
+                    writer.writeheader()
+                    for line in spool:
+                        writer.writerow(json.loads(line))
+            QMessageBox.information(
+                self,
+                "Success",
+                f"Differences exported to {save_path}"
+            )
+        except OSError as e:
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Failed to export differences: {str(e)}"
+            )
+
+    def remove_spool(self):
+        """Delete the previous comparison's spool file"""
+        if self.spool_path:
+            try:
+                os.unlink(self.spool_path)
+            except OSError:
+                pass
+            self.spool_path = None
+
+    def discard_results(self):
+        """Stop any comparison and delete its results, including the spool file"""
+        self.stop_compare()
+        self.remove_spool()
+        self.export_button.setEnabled(False)
+        self.diff_table.setRowCount(0)
+        self.totals_label.setText("")
+
+    def go_back(self):
+        """Discard the comparison and return to the previous page"""
+        self.discard_results()
+        self.back_requested.emit()
@@ -0,0 +1,387 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QLineEdit, QPushButton, QPlainTextEdit, QMessageBox)
+from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtGui import QFontDatabase, QTextCursor
+import bz2
+import lzma
+import os
+import re
+import threading
+import zlib
+from .formatting import format_size
+
+try:
+    import zstandard
+except ImportError:  # zstd previews are optional
+    zstandard = None
+
+
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.bz2': 'bzip2',
+    '.xz': 'xz',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+}
+
+
+def compression_for_key(key):
+    """Return the compression format implied by the key's extension, if any"""
+    _, ext = os.path.splitext(key.lower())
+    return COMPRESSION_EXTENSIONS.get(ext)
+
+
+def make_decompressor(compression):
+    """Create a fresh incremental decompressor for a single gzip/bzip2/xz stream"""
+    if compression == 'gzip':
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if compression == 'bzip2':
+        return bz2.BZ2Decompressor()
+    if compression == 'xz':
+        return lzma.LZMADecompressor()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+class CountingReader:
+    """File-like wrapper that counts the compressed bytes read from a body"""
+
+    def __init__(self, body):
+        self.body = body
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.body.read(size if size >= 0 else None)
+        self.bytes_read += len(data)
+        return data
+
+
+class StreamDecompressor:
+    """Pull-based decompressor with bounded output that follows concatenated streams
+
+    Each read returns at most the requested number of decompressed bytes,
+    however well the input compresses; input that did not fit is kept and
+    fed back on the next read. Rotated logs are often several gzip members
+    (or bz2/xz/zstd frames) appended together, so a new decompressor is
+    started whenever one reaches the end of its stream.
+    """
+
+    INPUT_SIZE = 64 * 1024
+
+    def __init__(self, body, compression):
+        self.source = CountingReader(body)
+        self.compression = compression
+        self.pending = b""  # Compressed input not yet consumed
+        if compression == 'zstd':
+            # zstd decompression objects have no output limit; the stream
+            # reader pulls input as needed instead
+            self.reader = zstandard.ZstdDecompressor().stream_reader(
+                self.source, read_size=self.INPUT_SIZE, read_across_frames=True
+            )
+        else:
+            self.reader = None
+            self.decompressor = make_decompressor(compression)
+
+    @property
+    def bytes_read(self):
+        """Compressed bytes read from the body so far"""
+        return self.source.bytes_read
+
+    def read(self, size):
+        """Return up to size decompressed bytes, or b"" once the input is exhausted"""
+        if self.reader is not None:
+            return self.reader.read(size)
+
+        while True:
+            if self.decompressor.eof:
+                # Input past the end of the stream; zlib also leaves a copy
+                # of it in unconsumed_tail, so pending is dropped
+                leftover = self.decompressor.unused_data
+                if not leftover:
+                    leftover = self.source.read(self.INPUT_SIZE)
+                    if not leftover:
+                        return b""
+                self.decompressor = make_decompressor(self.compression)
+                self.pending = leftover
+            elif not self.pending and getattr(self.decompressor, 'needs_input', True):
+                self.pending = self.source.read(self.INPUT_SIZE)
+                if not self.pending:
+                    # The body ended; return whatever is still buffered
+                    return self.decompress(size)
+
+            output = self.decompress(size)
+            if output:
+                return output
+
+    def decompress(self, size):
+        data, self.pending = self.pending, b""
+        output = self.decompressor.decompress(data, size)
+        if self.compression == 'gzip':
+            # zlib hands back the input it did not get to
+            self.pending = self.decompressor.unconsumed_tail
+        return output
+
+
+class DecompressWorker(QThread):
+    """Streams an object through a decompressor and emits lines in batches
+
+    The worker pauses after each batch until more lines are requested, so
+    only what the user has scrolled to is ever decompressed.
+    """
+
+    lines_ready = pyqtSignal(list)
+    progress = pyqtSignal(object, object, object)  # compressed bytes, lines scanned, lines shown (may exceed 32 bits)
+    stream_finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    CHUNK_SIZE = 64 * 1024
+    MAX_LINE_LENGTH = 64 * 1024
+
+    def __init__(self, s3_client, bucket, key, compression, batch_size, pattern=None,
+                 version_id=None):
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.extra_args = {'VersionId': version_id} if version_id else {}
+        self.compression = compression
+        self.batch_size = batch_size
+        self.pattern = pattern
+        self.credit = batch_size
+        self.stopped = False
+        self.condition = threading.Condition()
+
+    def request_more(self):
+        """Allow another batch of lines to be produced"""
+        with self.condition:
+            self.credit += self.batch_size
+            self.condition.notify()
+
+    def stop(self):
+        """Ask the worker to stop at the next chunk boundary"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+    def run(self):
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self.key, **self.extra_args)
+            body = response['Body']
+            stream = StreamDecompressor(body, self.compression)
+            pending = b""
+            lines_scanned = 0
+            lines_shown = 0
+
+            while not self.stopped:
+                # Bounded decompressed reads keep each batch small, however
+                # repetitive the data is
+                chunk = stream.read(self.CHUNK_SIZE)
+                bytes_read = stream.bytes_read
+                if chunk:
+                    pending += chunk
+                    raw_lines = pending.split(b"\n")
+                    pending = raw_lines.pop()
+                    # Never let a single unterminated line grow without bound
+                    if len(pending) > self.MAX_LINE_LENGTH:
+                        raw_lines.append(pending)
+                        pending = b""
+                else:
+                    raw_lines = [pending] if pending else []
+
+                batch = []
+                for raw_line in raw_lines:
+                    lines_scanned += 1
+                    line = raw_line.rstrip(b"\r").decode('utf-8', errors='replace')
+                    if self.pattern is None:
+                        batch.append(line)
+                    elif self.pattern.search(line):
+                        batch.append(f"{lines_scanned}: {line}")
+                lines_shown += len(batch)
+
+                while batch and not self.stopped:
+                    with self.condition:
+                        while self.credit <= 0 and not self.stopped:
+                            self.progress.emit(bytes_read, lines_scanned, lines_shown)
+                            self.condition.wait()
+                        take = min(self.credit, len(batch))
+                        self.credit -= take
+                    self.lines_ready.emit(batch[:take])
+                    batch = batch[take:]
+
+                self.progress.emit(bytes_read, lines_scanned, lines_shown)
+                if not chunk:
+                    self.stream_finished.emit()
+                    break
+
+            body.close()
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class CompressedPreviewDialog(QDialog):
+    """Preview of compressed text objects that decompresses while streaming"""
+
+    BATCH_SIZE = 1000
+    # Oldest lines are dropped from the view beyond this, keeping memory flat
+    MAX_LINES = 100000
+
+    def __init__(self, s3_client, bucket, key, size, compression, version_id=None, parent=None):
+        super().__init__(parent)
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.compression = compression
+        self.version_id = version_id
+        self.worker = None
+        # Set while the dialog itself changes the text, so only the user's
+        # scrolling asks the worker for more lines
+        self.updating_view = False
+
+        self.setWindowTitle(f"Preview: {os.path.basename(key)}")
+        self.resize(800, 600)
+        self.setup_ui()
+        self.start_stream()
+
+    def setup_ui(self):
+        """Set up the user interface"""
+        layout = QVBoxLayout()
+
+        # Grep bar
+        grep_bar = QHBoxLayout()
+        grep_bar.addWidget(QLabel("Grep:"))
+        self.grep_input = QLineEdit()
+        self.grep_input.setPlaceholderText("Regular expression (case-insensitive), empty to show all lines")
+        self.grep_input.returnPressed.connect(self.start_stream)
+        grep_bar.addWidget(self.grep_input)
+        grep_button = QPushButton("Apply")
+        grep_button.clicked.connect(self.start_stream)
+        grep_bar.addWidget(grep_button)
+        layout.addLayout(grep_bar)
+
+        self.text_view = QPlainTextEdit()
+        self.text_view.setReadOnly(True)
+        self.text_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.text_view.setMaximumBlockCount(self.MAX_LINES)
+        self.text_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.text_view.verticalScrollBar().valueChanged.connect(self.on_scroll)
+        layout.addWidget(self.text_view)
+
+        # Status and controls
+        bottom_bar = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom_bar.addWidget(self.status_label)
+        bottom_bar.addStretch()
+        self.more_button = QPushButton("Load More")
+        self.more_button.clicked.connect(self.request_more)
+        bottom_bar.addWidget(self.more_button)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        bottom_bar.addWidget(close_btn)
+        layout.addLayout(bottom_bar)
+
+        self.setLayout(layout)
+
+    def start_stream(self):
+        """(Re)start streaming from the beginning with the current grep pattern"""
+        self.stop_stream()
+
+        pattern = None
+        text = self.grep_input.text()
+        if text:
+            try:
+                pattern = re.compile(text, re.IGNORECASE)
+            except re.error:
+                pattern = re.compile(re.escape(text), re.IGNORECASE)
+
+        self.updating_view = True
+        self.text_view.clear()
+        self.updating_view = False
+        self.more_button.setEnabled(True)
+        self.worker = DecompressWorker(
+            self.s3_client,
+            self.bucket,
+            self.key,
+            self.compression,
+            self.BATCH_SIZE,
+            pattern,
+            self.version_id
+        )
+        self.worker.lines_ready.connect(self.on_lines_ready)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.stream_finished.connect(self.on_stream_finished)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.start()
+
+    def stop_stream(self):
+        """Stop the current worker, if any, and wait for it to exit"""
+        if self.worker:
+            self.worker.lines_ready.disconnect()
+            self.worker.progress.disconnect()
+            self.worker.stream_finished.disconnect()
+            self.worker.failed.disconnect()
+            self.worker.stop()
+            self.worker.wait()
+            self.worker = None
+
+    def request_more(self):
+        """Ask the worker for the next batch of lines"""
+        if self.worker:
+            self.worker.request_more()
+
+    def on_scroll(self, value):
+        """Load more lines when the user scrolls near the bottom"""
+        if self.updating_view:
+            return
+        scroll_bar = self.text_view.verticalScrollBar()
+        if value >= scroll_bar.maximum() - scroll_bar.pageStep():
+            self.request_more()
+
+    def on_lines_ready(self, lines):
+        """Append a batch of decompressed lines without moving the view"""
+        # appendPlainText would follow the end of the text whenever the view
+        # is at the bottom, which an empty view always is
+        scroll_bar = self.text_view.verticalScrollBar()
+        value = scroll_bar.value()
+        self.updating_view = True
+        cursor = QTextCursor(self.text_view.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.text_view.document().isEmpty():
+            cursor.insertText("\n")
+        cursor.insertText("\n".join(lines))
+        scroll_bar.setValue(value)
+        self.updating_view = False
+
+        # Keep going until there is something to scroll, e.g. sparse grep hits
+        if scroll_bar.maximum() == 0:
+            self.request_more()
+
+    def on_progress(self, bytes_read, lines_scanned, lines_shown):
+        """Update the status line"""
+        percent = (bytes_read / self.size * 100) if self.size else 100
+        status = (
+            f"Read {format_size(bytes_read)} of {format_size(self.size)} "
+            f"({percent:.1f}%), {lines_scanned} lines decompressed"
+        )
+        if self.worker and self.worker.pattern is not None:
+            status += f", {lines_shown} matches"
+        self.status_label.setText(status)
+
+    def on_stream_finished(self):
+        """Handle reaching the end of the object"""
+        self.more_button.setEnabled(False)
+        self.status_label.setText(self.status_label.text() + " - end of file")
+
+    def on_failed(self, message):
+        """Show a streaming error"""
+        self.more_button.setEnabled(False)
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to preview file: {message}"
+        )
+
+    def done(self, result):
+        """Stop streaming however the dialog is closed"""
+        self.stop_stream()
+        super().done(result)
@@ -0,0 +1,259 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QLineEdit, QPushButton, QPlainTextEdit, QScrollBar,
+                             QMessageBox)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QFontDatabase
+from botocore.exceptions import BotoCoreError, ClientError
+import mmap
+import os
+import tempfile
+from .formatting import format_size
+
+
+class SparseRangeCache:
+    """Sparse local copy of an S3 object filled in block by block with ranged GETs"""
+
+    BLOCK_SIZE = 64 * 1024
+
+    def __init__(self, s3_client, bucket, key, size, version_id=None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.extra_args = {'VersionId': version_id} if version_id else {}
+        self.fetched_blocks = set()
+        self.bytes_fetched = 0
+
+        # Reserve the full length without writing it. Where the filesystem
+        # supports sparse files (ext4, APFS, ...) only fetched blocks use disk
+        # space; elsewhere, e.g. NTFS, the full size is allocated
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_file.truncate(size)
+        self.temp_file.flush()
+        self.mm = mmap.mmap(self.temp_file.fileno(), size) if size else None
+
+    def ensure_range(self, start, end):
+        """Make sure bytes [start, end) are present in the local cache"""
+        end = min(end, self.size)
+        if start >= end:
+            return
+
+        first_block = start // self.BLOCK_SIZE
+        last_block = (end - 1) // self.BLOCK_SIZE
+
+        # Coalesce consecutive missing blocks into a single ranged GET
+        run_start = None
+        for block in range(first_block, last_block + 2):
+            missing = block <= last_block and block not in self.fetched_blocks
+            if missing and run_start is None:
+                run_start = block
+            elif not missing and run_start is not None:
+                self.fetch_blocks(run_start, block)
+                run_start = None
+
+    def fetch_blocks(self, first_block, stop_block):
+        """Fetch blocks [first_block, stop_block) into the mapped file"""
+        range_start = first_block * self.BLOCK_SIZE
+        range_end = min(stop_block * self.BLOCK_SIZE, self.size) - 1
+        response = self.s3_client.get_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Range=f"bytes={range_start}-{range_end}",
+            **self.extra_args
+        )
+        data = response['Body'].read()
+        self.mm[range_start:range_start + len(data)] = data
+        self.bytes_fetched += len(data)
+        self.fetched_blocks.update(range(first_block, stop_block))
+
+    def read(self, start, length, fetch=True):
+        """Return up to length bytes starting at start, fetching as needed
+
+        With fetch=False nothing is downloaded and blocks not fetched yet
+        read as zeros; use is_cached to tell them apart.
+        """
+        end = min(start + length, self.size)
+        if fetch:
+            self.ensure_range(start, end)
+        return self.mm[start:end] if self.mm else b""
+
+    def is_cached(self, offset):
+        """Whether the block holding offset has been fetched"""
+        return offset // self.BLOCK_SIZE in self.fetched_blocks
+
+    def close(self):
+        """Release the mapping and remove the cache file"""
+        if self.mm:
+            self.mm.close()
+            self.mm = None
+        self.temp_file.close()
+        try:
+            os.unlink(self.temp_file.name)
+        except OSError:
+            pass
+
+
+class HexViewerDialog(QDialog):
+    """Hex/ASCII viewer that only downloads and renders the visible rows"""
+
+    BYTES_PER_ROW = 16
+    # QScrollBar works on 32-bit ints, so very large objects scroll in steps
+    # of several rows to keep the range representable
+    MAX_SCROLL_VALUE = 2 ** 30
+    # Missing rows are fetched once scrolling pauses for this long, so a
+    # thumb drag across a huge object does not issue a GET per position
+    FETCH_DELAY_MS = 150
+
+    def __init__(self, s3_client, bucket, key, size, version_id=None, parent=None):
+        super().__init__(parent)
+        self.cache = SparseRangeCache(s3_client, bucket, key, size, version_id)
+        self.size = size
+        self.total_rows = (size + self.BYTES_PER_ROW - 1) // self.BYTES_PER_ROW
+        self.rows_per_step = max(1, -(-self.total_rows // self.MAX_SCROLL_VALUE))
+        self.top_row = 0
+        self.fetch_error = None  # Set once a fetch failed; no more are attempted
+
+        self.fetch_timer = QTimer(self)
+        self.fetch_timer.setSingleShot(True)
+        self.fetch_timer.setInterval(self.FETCH_DELAY_MS)
+        self.fetch_timer.timeout.connect(self.render_rows)
+
+        self.setWindowTitle(f"Hex View: {os.path.basename(key)}")
+        self.resize(800, 600)
+        self.setup_ui()
+        self.render_rows()
+
+    def setup_ui(self):
+        """Set up the user interface"""
+        layout = QVBoxLayout()
+
+        # Jump-to-offset bar
+        offset_bar = QHBoxLayout()
+        offset_bar.addWidget(QLabel("Go to offset:"))
+        self.offset_input = QLineEdit()
+        self.offset_input.setPlaceholderText("e.g. 0x1F400 or 128000")
+        self.offset_input.returnPressed.connect(self.jump_to_offset)
+        offset_bar.addWidget(self.offset_input)
+        go_button = QPushButton("Go")
+        go_button.clicked.connect(self.jump_to_offset)
+        offset_bar.addWidget(go_button)
+        layout.addLayout(offset_bar)
+
+        # Rows are drawn into a plain text view; scrolling is driven by our own
+        # scroll bar so the view never holds more than one screen of text
+        view_layout = QHBoxLayout()
+        self.hex_view = QPlainTextEdit()
+        self.hex_view.setReadOnly(True)
+        self.hex_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.hex_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.hex_view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.hex_view.wheelEvent = self.on_wheel
+        view_layout.addWidget(self.hex_view)
+
+        self.scroll_bar = QScrollBar(Qt.Orientation.Vertical)
+        self.scroll_bar.setRange(0, max(0, (self.total_rows - 1) // self.rows_per_step))
+        self.scroll_bar.valueChanged.connect(self.on_scroll)
+        view_layout.addWidget(self.scroll_bar)
+        layout.addLayout(view_layout)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+
+        self.setLayout(layout)
+
+    def visible_row_count(self):
+        """Number of rows that fit in the view"""
+        line_height = self.hex_view.fontMetrics().lineSpacing()
+        return max(1, self.hex_view.viewport().height() // max(1, line_height))
+
+    def render_rows(self, fetch=True):
+        """Draw only the rows currently in view, fetching them unless told not to"""
+        row_count = self.visible_row_count()
+        start = self.top_row * self.BYTES_PER_ROW
+        fetch = fetch and self.fetch_error is None
+        try:
+            data = self.cache.read(start, row_count * self.BYTES_PER_ROW, fetch)
+        except (ClientError, BotoCoreError) as e:
+            # Report once; rendering carries on from what is already cached
+            self.fetch_error = str(e)
+            self.fetch_timer.stop()
+            QMessageBox.critical(
+                self,
+                "Error",
+                f"Failed to read object: {str(e)}"
+            )
+            data = self.cache.read(start, row_count * self.BYTES_PER_ROW, fetch=False)
+
+        lines = []
+        for i in range(0, len(data), self.BYTES_PER_ROW):
+            chunk = data[i:i + self.BYTES_PER_ROW]
+            if not self.cache.is_cached(start + i):
+                # Rows never straddle blocks, so a row is all there or not at all
+                lines.append(f"{start + i:012x}  {' '.join(['??'] * len(chunk)):<47}")
+                continue
+            hex_part = " ".join(f"{b:02x}" for b in chunk)
+            ascii_part = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+            lines.append(f"{start + i:012x}  {hex_part:<47}  {ascii_part}")
+        self.hex_view.setPlainText("\n".join(lines))
+
+        self.scroll_bar.setPageStep(max(1, row_count // self.rows_per_step))
+        self.status_label.setText(
+            f"Offset 0x{start:x} of 0x{self.size:x} "
+            f"({format_size(self.cache.bytes_fetched)} downloaded of "
+            f"{format_size(self.size)})"
+            + (f" - fetching stopped: {self.fetch_error}" if self.fetch_error else "")
+        )
+
+    def on_scroll(self, value):
+        """Handle scroll bar movement"""
+        self.top_row = min(value * self.rows_per_step, max(0, self.total_rows - 1))
+        self.render_rows(fetch=False)
+        if self.fetch_error is None:
+            self.fetch_timer.start()
+
+    def on_wheel(self, event):
+        """Scroll three rows per wheel notch"""
+        steps = event.angleDelta().y() // 120
+        self.scroll_bar.setValue(self.scroll_bar.value() - steps * max(1, 3 // self.rows_per_step))
+
+    def jump_to_offset(self):
+        """Scroll so that the entered offset is the first row"""
+        text = self.offset_input.text().strip().lower()
+        try:
+            offset = int(text, 16) if text.startswith("0x") else int(text)
+        except ValueError:
+            QMessageBox.warning(
+                self,
+                "Invalid Offset",
+                "Enter a decimal offset or a hexadecimal one starting with 0x."
+            )
+            return
+
+        if not 0 <= offset < max(1, self.size):
+            QMessageBox.warning(
+                self,
+                "Invalid Offset",
+                f"Offset must be between 0 and {max(0, self.size - 1)}."
+            )
+            return
+
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setValue(offset // self.BYTES_PER_ROW // self.rows_per_step)
+        self.scroll_bar.blockSignals(False)
+        self.top_row = offset // self.BYTES_PER_ROW
+        self.render_rows()
+
+    def resizeEvent(self, event):
+        """Re-render when the number of visible rows changes"""
+        super().resizeEvent(event)
+        self.render_rows()
+
+    def done(self, result):
+        """Clean up the local cache file however the dialog is closed"""
+        self.fetch_timer.stop()
+        self.cache.close()
+        super().done(result)
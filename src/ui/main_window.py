@@ -1,8 +1,10 @@
 from PyQt6.QtWidgets import QMainWindow, QStackedWidget
 from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QKeySequence, QShortcut
 from .credential_page import CredentialPage
 from .bucket_list_page import BucketListPage
 from .bucket_explorer_page import BucketExplorerPage
+from .compare_page import ComparePage
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -18,16 +20,29 @@ class MainWindow(QMainWindow):
         self.credential_page = CredentialPage()
         self.bucket_list_page = BucketListPage()
         self.bucket_explorer_page = BucketExplorerPage()
+        self.compare_page = ComparePage()
+        self.compare_return_page = None
         
         # Add pages to stacked widget
         self.stacked_widget.addWidget(self.credential_page)
         self.stacked_widget.addWidget(self.bucket_list_page)
         self.stacked_widget.addWidget(self.bucket_explorer_page)
+        self.stacked_widget.addWidget(self.compare_page)
         
         # Connect signals
         self.credential_page.credentials_selected.connect(self.on_credentials_selected)
         self.bucket_list_page.bucket_selected.connect(self.on_bucket_selected)
         self.bucket_explorer_page.back_to_buckets.connect(self.show_bucket_list)
+        self.bucket_explorer_page.history_restored.connect(self.show_bucket_explorer)
+        self.bucket_list_page.compare_requested.connect(self.show_compare)
+        self.bucket_explorer_page.compare_requested.connect(self.show_compare)
+        self.compare_page.back_requested.connect(self.close_compare)
+        
+        # Back/forward history spans the bucket list and explorer views
+        back_shortcut = QShortcut(QKeySequence(QKeySequence.StandardKey.Back), self)
+        back_shortcut.activated.connect(self.navigate_back)
+        forward_shortcut = QShortcut(QKeySequence(QKeySequence.StandardKey.Forward), self)
+        forward_shortcut.activated.connect(self.navigate_forward)
         
         # Show credential page by default
         self.stacked_widget.setCurrentWidget(self.credential_page)
@@ -45,4 +60,34 @@ class MainWindow(QMainWindow):
     
     def show_bucket_list(self):
         """Switch back to bucket list view"""
-        self.stacked_widget.setCurrentWidget(self.bucket_list_page) 
\ No newline at end of file
+        self.stacked_widget.setCurrentWidget(self.bucket_list_page)
+    
+    def show_bucket_explorer(self):
+        """Switch to the explorer view"""
+        self.stacked_widget.setCurrentWidget(self.bucket_explorer_page)
+    
+    def navigate_back(self):
+        """Go back in the browsing history"""
+        if self.stacked_widget.currentWidget() in (self.bucket_list_page, self.bucket_explorer_page):
+            self.bucket_explorer_page.history_back()
+    
+    def navigate_forward(self):
+        """Go forward in the browsing history"""
+        if self.stacked_widget.currentWidget() in (self.bucket_list_page, self.bucket_explorer_page):
+            self.bucket_explorer_page.history_forward()
+    
+    def show_compare(self, bucket="", prefix=""):
+        """Open the compare view, pre-filled with the current location"""
+        session = self.bucket_list_page.session
+        self.compare_page.prepare(session.profile_name if session else None, bucket, prefix)
+        self.compare_return_page = self.stacked_widget.currentWidget()
+        self.stacked_widget.setCurrentWidget(self.compare_page)
+    
+    def close_compare(self):
+        """Return from the compare view to where it was opened"""
+        self.stacked_widget.setCurrentWidget(self.compare_return_page or self.bucket_list_page)
+    
+    def closeEvent(self, event):
+        """Stop background work and remove temporary files on exit"""
+        self.compare_page.discard_results()
+        super().closeEvent(event)
@@ -0,0 +1,112 @@
+class ViewState:
+    """Snapshot of an explorer view that can be restored without re-listing
+
+    A state with no bucket stands for the bucket list page.
+    """
+
+    # Rough cost of one listing entry (dict, datetime, ints) besides its strings
+    OBJECT_OVERHEAD_BYTES = 600
+
+    def __init__(self, s3_client=None, bucket=None, prefix="", objects=None,
+                 sort_column=0, sort_order=None, current_page=1,
+                 selected_keys=None, scroll_value=0, filter_text=""):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.objects = objects
+        self.sort_column = sort_column
+        self.sort_order = sort_order
+        self.current_page = current_page
+        self.selected_keys = selected_keys or set()
+        self.scroll_value = scroll_value
+        self.filter_text = filter_text
+        self.size_bytes = self.estimate_size()
+
+    def is_bucket_list(self):
+        """Whether this state is the bucket list rather than a folder view"""
+        return self.bucket is None
+
+    def estimate_size(self):
+        """Approximate memory held by the retained listing"""
+        if not self.objects:
+            return 0
+        return sum(
+            self.OBJECT_OVERHEAD_BYTES + len(obj['Key']) + len(obj['ContentType'])
+            for obj in self.objects
+        )
+
+    def drop_objects(self):
+        """Release the retained listing; restoring will re-list instead"""
+        self.objects = None
+        self.size_bytes = 0
+
+
+class NavigationHistory:
+    """Browser-style back/forward stacks with a cap on retained listing memory"""
+
+    def __init__(self, max_entries=50, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.back_stack = []
+        self.forward_stack = []
+
+    def push(self, state):
+        """Record the state being left when navigating somewhere new"""
+        self.back_stack.append(state)
+        self.forward_stack.clear()
+        self.enforce_limits()
+
+    def back(self, current_state):
+        """Step back, returning the state to restore or None"""
+        if not self.back_stack:
+            return None
+        self.forward_stack.append(current_state)
+        state = self.back_stack.pop()
+        self.enforce_limits()
+        return state
+
+    def forward(self, current_state):
+        """Step forward, returning the state to restore or None"""
+        if not self.forward_stack:
+            return None
+        self.back_stack.append(current_state)
+        state = self.forward_stack.pop()
+        self.enforce_limits()
+        return state
+
+    def can_go_back(self):
+        return bool(self.back_stack)
+
+    def can_go_forward(self):
+        return bool(self.forward_stack)
+
+    def entry_count(self):
+        return len(self.back_stack) + len(self.forward_stack)
+
+    def memory_used(self):
+        """Approximate bytes held by retained listings"""
+        return sum(state.size_bytes for state in self.back_stack + self.forward_stack)
+
+    def enforce_limits(self):
+        """Drop the entries farthest from the current view until within limits"""
+        while self.entry_count() > self.max_entries:
+            if len(self.back_stack) >= len(self.forward_stack):
+                self.back_stack.pop(0)
+            else:
+                self.forward_stack.pop(0)
+
+        # Over the memory cap, keep the entries but forget their listings,
+        # starting with the most distant ones
+        back_index = 0
+        forward_index = 0
+        while self.memory_used() > self.max_bytes:
+            remaining_back = len(self.back_stack) - back_index
+            remaining_forward = len(self.forward_stack) - forward_index
+            if remaining_back >= remaining_forward and remaining_back > 0:
+                self.back_stack[back_index].drop_objects()
+                back_index += 1
+            elif remaining_forward > 0:
+                self.forward_stack[forward_index].drop_objects()
+                forward_index += 1
+            else:
+                break
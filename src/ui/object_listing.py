@@ -0,0 +1,139 @@
+from PyQt6.QtCore import QThread, pyqtSignal
+import fnmatch
+import re
+
+
+WILDCARD_CHARS = "*?["
+
+
+def split_filter_query(query):
+    """Split a name filter into an S3-side prefix and a client-side matcher
+
+    Everything before the first glob wildcard is a literal and can be pushed
+    down as part of the listing Prefix. Without wildcards the query is a plain
+    prefix and no client-side matching is needed; otherwise the whole query is
+    matched as a glob against each name.
+    """
+    literal_end = len(query)
+    for i, char in enumerate(query):
+        if char in WILDCARD_CHARS:
+            literal_end = i
+            break
+
+    if literal_end == len(query):
+        return query, None
+    return query[:literal_end], re.compile(fnmatch.translate(query))
+
+
+def iter_listing_pages(s3_client, bucket, prefix, name_prefix="", matcher=None,
+                       start_after=None, known_objects=None, is_cancelled=None):
+    """Yield one list of folder/file entries per list_objects_v2 page
+
+    Content types are looked up with HEAD, except for objects in
+    known_objects whose ETag has not changed. is_cancelled is polled between
+    HEAD requests so a superseded listing stops promptly.
+    """
+    known_objects = known_objects or {}
+    params = {
+        'Bucket': bucket,
+        'Prefix': prefix + name_prefix,
+        'Delimiter': '/'  # List objects with delimiter for proper folder structure
+    }
+    if start_after:
+        params['StartAfter'] = start_after
+
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for response in paginator.paginate(**params):
+        objects = []
+
+        # Add folders (CommonPrefixes)
+        for common_prefix in response.get('CommonPrefixes', []):
+            folder_name = common_prefix['Prefix']
+            if matcher and not matcher.match(folder_name[len(prefix):].rstrip('/')):
+                continue
+            objects.append({
+                'Key': folder_name,
+                'Size': 0,
+                'LastModified': None,
+                'ContentType': 'folder',
+                'ETag': None,
+                'is_folder': True
+            })
+
+        # Add files
+        for obj in response.get('Contents', []):
+            if is_cancelled and is_cancelled():
+                return
+            key = obj['Key']
+            # Skip the current prefix itself
+            if key == prefix:
+                continue
+            if matcher and not matcher.match(key[len(prefix):]):
+                continue
+
+            # Get content type, unless we already know it for this ETag
+            known = known_objects.get(key)
+            if known and known['ETag'] == obj.get('ETag'):
+                content_type = known['ContentType']
+            else:
+                try:
+                    head_response = s3_client.head_object(Bucket=bucket, Key=key)
+                    content_type = head_response.get('ContentType', 'N/A')
+                except:
+                    content_type = 'N/A'
+
+            objects.append({
+                'Key': key,
+                'Size': obj['Size'],
+                'LastModified': obj['LastModified'],
+                'ContentType': content_type,
+                'ETag': obj.get('ETag'),
+                'is_folder': False
+            })
+
+        yield objects
+
+
+class ListingWorker(QThread):
+    """Lists a prefix in the background and emits entries page by page"""
+
+    page_ready = pyqtSignal(object)  # list of entry dicts, kept as Python objects
+    listing_finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, s3_client, bucket, prefix, name_prefix="", matcher=None,
+                 start_after=None, known_objects=None):
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.name_prefix = name_prefix
+        self.matcher = matcher
+        self.start_after = start_after
+        self.known_objects = known_objects
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the page currently being fetched"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            for objects in iter_listing_pages(
+                self.s3_client,
+                self.bucket,
+                self.prefix,
+                self.name_prefix,
+                self.matcher,
+                self.start_after,
+                self.known_objects,
+                is_cancelled=lambda: self.cancelled
+            ):
+                if self.cancelled:
+                    return
+                self.page_ready.emit(objects)
+            if not self.cancelled:
+                self.listing_finished.emit()
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
@@ -0,0 +1,671 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QTableView, QTabWidget)
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, pyqtSignal
+from collections import OrderedDict
+import csv
+import io
+import os
+import struct
+from .formatting import format_size
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet sample rows are optional; the footer is parsed here
+    pq = None
+
+
+TABULAR_EXTENSIONS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.csv': 'csv',
+    '.tsv': 'tsv',
+    '.tab': 'tsv',
+}
+
+
+def tabular_format_for_key(key):
+    """Return the tabular format implied by the key's extension, if any"""
+    _, ext = os.path.splitext(key.lower())
+    return TABULAR_EXTENSIONS.get(ext)
+
+
+class RangedObjectReader:
+    """Seekable read-only file over an S3 object backed by ranged GETs
+
+    Reads are rounded to whole blocks, consecutive missing blocks are fetched
+    with one request, and recently used blocks are kept in a bounded cache.
+    """
+
+    BLOCK_SIZE = 64 * 1024
+    MAX_CACHED_BLOCKS = 512
+
+    def __init__(self, s3_client, bucket, key, size, version_id=None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.size = size
+        self.extra_args = {'VersionId': version_id} if version_id else {}
+        self.blocks = OrderedDict()
+        self.position = 0
+        self.bytes_transferred = 0
+        self.request_count = 0
+        self.closed = False
+        self.cancelled = False
+
+    def cancel(self):
+        """Make further reads fail, so a background reader stops promptly"""
+        self.cancelled = True
+
+    def read_range(self, start, end):
+        """Return bytes [start, end) of the object"""
+        if self.cancelled:
+            raise IOError("Read cancelled")
+        end = min(end, self.size)
+        if start >= end:
+            return b""
+
+        first_block = start // self.BLOCK_SIZE
+        last_block = (end - 1) // self.BLOCK_SIZE
+
+        run_start = None
+        for block in range(first_block, last_block + 2):
+            missing = block <= last_block and block not in self.blocks
+            if missing and run_start is None:
+                run_start = block
+            elif not missing and run_start is not None:
+                self.fetch_blocks(run_start, block)
+                run_start = None
+
+        data = b"".join(self.blocks[block] for block in range(first_block, last_block + 1))
+        for block in range(first_block, last_block + 1):
+            self.blocks.move_to_end(block)
+        while len(self.blocks) > self.MAX_CACHED_BLOCKS:
+            self.blocks.popitem(last=False)
+
+        offset = start - first_block * self.BLOCK_SIZE
+        return data[offset:offset + end - start]
+
+    def fetch_blocks(self, first_block, stop_block):
+        """Fetch blocks [first_block, stop_block) with a single ranged GET"""
+        range_start = first_block * self.BLOCK_SIZE
+        range_end = min(stop_block * self.BLOCK_SIZE, self.size) - 1
+        response = self.s3_client.get_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Range=f"bytes={range_start}-{range_end}",
+            **self.extra_args
+        )
+        data = response['Body'].read()
+        self.bytes_transferred += len(data)
+        self.request_count += 1
+        for block in range(first_block, stop_block):
+            offset = (block - first_block) * self.BLOCK_SIZE
+            self.blocks[block] = data[offset:offset + self.BLOCK_SIZE]
+
+    # File-like interface, used by pyarrow
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size - self.position
+        data = self.read_range(self.position, self.position + size)
+        self.position += len(data)
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def writable(self):
+        return False
+
+    def close(self):
+        self.closed = True
+
+
+class ThriftCompactReader:
+    """Decoder for the Thrift compact protocol used by Parquet footers
+
+    Structs are returned as dicts keyed by field id, which is all that is
+    needed to pick out the handful of metadata fields shown in the preview.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+
+    def read_byte(self):
+        value = self.data[self.pos]
+        self.pos += 1
+        return value
+
+    def read_varint(self):
+        result = 0
+        shift = 0
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7f) << shift
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def read_zigzag(self):
+        value = self.read_varint()
+        return (value >> 1) ^ -(value & 1)
+
+    def read_value(self, value_type):
+        if value_type in (1, 2):  # bool inside a collection
+            return self.read_byte() == 1
+        if value_type == 3:
+            return struct.unpack('b', bytes([self.read_byte()]))[0]
+        if value_type in (4, 5, 6):
+            return self.read_zigzag()
+        if value_type == 7:
+            value = struct.unpack('<d', self.data[self.pos:self.pos + 8])[0]
+            self.pos += 8
+            return value
+        if value_type == 8:
+            length = self.read_varint()
+            value = bytes(self.data[self.pos:self.pos + length])
+            self.pos += length
+            return value
+        if value_type in (9, 10):
+            return self.read_list()
+        if value_type == 11:
+            return self.read_map()
+        if value_type == 12:
+            return self.read_struct()
+        raise ValueError(f"Unknown Thrift compact type {value_type}")
+
+    def read_list(self):
+        header = self.read_byte()
+        size = header >> 4
+        element_type = header & 0x0f
+        if size == 15:
+            size = self.read_varint()
+        return [self.read_value(element_type) for _ in range(size)]
+
+    def read_map(self):
+        size = self.read_varint()
+        if not size:
+            return {}
+        types = self.read_byte()
+        return {
+            self.read_value(types >> 4): self.read_value(types & 0x0f)
+            for _ in range(size)
+        }
+
+    def read_struct(self):
+        fields = {}
+        last_field_id = 0
+        while True:
+            header = self.read_byte()
+            if header == 0:
+                return fields
+            field_type = header & 0x0f
+            delta = header >> 4
+            field_id = last_field_id + delta if delta else self.read_zigzag()
+            last_field_id = field_id
+            if field_type in (1, 2):  # bool values live in the field header
+                fields[field_id] = field_type == 1
+            else:
+                fields[field_id] = self.read_value(field_type)
+
+
+PHYSICAL_TYPES = ['BOOLEAN', 'INT32', 'INT64', 'INT96', 'FLOAT', 'DOUBLE',
+                  'BYTE_ARRAY', 'FIXED_LEN_BYTE_ARRAY']
+REPETITION_TYPES = ['REQUIRED', 'OPTIONAL', 'REPEATED']
+CODECS = ['UNCOMPRESSED', 'SNAPPY', 'GZIP', 'LZO', 'BROTLI', 'LZ4', 'ZSTD', 'LZ4_RAW']
+CONVERTED_TYPES = {
+    0: 'UTF8', 1: 'MAP', 2: 'MAP_KEY_VALUE', 3: 'LIST', 4: 'ENUM', 5: 'DECIMAL',
+    6: 'DATE', 7: 'TIME_MILLIS', 8: 'TIME_MICROS', 9: 'TIMESTAMP_MILLIS',
+    10: 'TIMESTAMP_MICROS', 11: 'UINT_8', 12: 'UINT_16', 13: 'UINT_32',
+    14: 'UINT_64', 15: 'INT_8', 16: 'INT_16', 17: 'INT_32', 18: 'INT_64',
+    19: 'JSON', 20: 'BSON', 21: 'INTERVAL',
+}
+LOGICAL_TYPES = {
+    1: 'STRING', 2: 'MAP', 3: 'LIST', 4: 'ENUM', 5: 'DECIMAL', 6: 'DATE',
+    7: 'TIME', 8: 'TIMESTAMP', 10: 'INTEGER', 11: 'NULL', 12: 'JSON',
+    13: 'BSON', 14: 'UUID', 15: 'FLOAT16',
+}
+
+
+def name_from(names, index):
+    """Look up an enum name, falling back to the raw value"""
+    if isinstance(names, dict):
+        return names.get(index, str(index))
+    return names[index] if 0 <= index < len(names) else str(index)
+
+
+def read_parquet_footer(reader):
+    """Read and decode the Parquet FileMetaData using only the file's tail"""
+    if reader.size < 12:
+        raise ValueError("File is too small to be Parquet")
+
+    # Start at the block holding the 8-byte length and magic, so the tail is
+    # one block; a longer footer costs one more request for the rest
+    block_size = RangedObjectReader.BLOCK_SIZE
+    tail_start = (reader.size - 8) // block_size * block_size
+    tail = reader.read_range(tail_start, reader.size)
+    if tail[-4:] != b"PAR1":
+        raise ValueError("Missing Parquet magic bytes; the file may be encrypted or not Parquet")
+
+    metadata_length = struct.unpack('<I', tail[-8:-4])[0]
+    metadata_start = reader.size - 8 - metadata_length
+    if metadata_start < 0:
+        raise ValueError("Invalid Parquet footer length")
+    if metadata_start >= tail_start:
+        metadata = tail[metadata_start - tail_start:-8]
+    else:
+        metadata = reader.read_range(metadata_start, reader.size - 8)
+    return ThriftCompactReader(metadata).read_struct()
+
+
+def format_statistic(value, physical_type):
+    """Render a min/max statistic according to the column's physical type"""
+    if value is None:
+        return ""
+    try:
+        if physical_type == 0:
+            return str(bool(value[0]))
+        if physical_type == 1:
+            return str(struct.unpack('<i', value)[0])
+        if physical_type == 2:
+            return str(struct.unpack('<q', value)[0])
+        if physical_type == 4:
+            return f"{struct.unpack('<f', value)[0]:g}"
+        if physical_type == 5:
+            return f"{struct.unpack('<d', value)[0]:g}"
+        return value.decode('utf-8')[:100]
+    except (struct.error, UnicodeDecodeError):
+        return value[:32].hex()
+
+
+class RowTableModel(QAbstractTableModel):
+    """Read-only table model; the view only asks for the cells on screen"""
+
+    def __init__(self, headers, rows, parent=None):
+        super().__init__(parent)
+        self.headers = headers
+        self.rows = rows
+
+    def rowCount(self, parent=None):
+        return len(self.rows)
+
+    def columnCount(self, parent=None):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        return row[index.column()] if index.column() < len(row) else ""
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.headers[section] if section < len(self.headers) else ""
+        return str(section + 1)
+
+    def append_rows(self, rows):
+        """Add rows at the end of the table"""
+        if not rows:
+            return
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+
+class ParquetSampleWorker(QThread):
+    """Reads the first rows of a Parquet object's first row group with pyarrow
+
+    pyarrow reads whole column chunks, so columns are taken in schema order
+    only while their compressed chunks in row group 0 stay under a cap.
+    """
+
+    rows_ready = pyqtSignal(object)  # (columns, rows, note)
+    failed = pyqtSignal(str)
+
+    def __init__(self, reader, sample_rows, max_columns, max_bytes):
+        super().__init__()
+        self.reader = reader
+        self.sample_rows = sample_rows
+        self.max_columns = max_columns
+        self.max_bytes = max_bytes
+
+    def run(self):
+        try:
+            parquet_file = pq.ParquetFile(
+                self.reader,
+                buffer_size=RangedObjectReader.BLOCK_SIZE,
+                pre_buffer=False
+            )
+            row_group = parquet_file.metadata.row_group(0)
+            chunk_sizes = {}
+            for index in range(row_group.num_columns):
+                column = row_group.column(index)
+                name = column.path_in_schema.split('.')[0]
+                chunk_sizes[name] = chunk_sizes.get(name, 0) + column.total_compressed_size
+
+            names = parquet_file.schema_arrow.names
+            columns = []
+            total = 0
+            for name in names[:self.max_columns]:
+                if total + chunk_sizes.get(name, 0) > self.max_bytes:
+                    break
+                columns.append(name)
+                total += chunk_sizes.get(name, 0)
+
+            if names and not columns:
+                self.rows_ready.emit((
+                    [], [],
+                    f"Sample rows skipped: the first column chunk alone is "
+                    f"{format_size(chunk_sizes.get(names[0], 0))} compressed."
+                ))
+                return
+
+            batch = next(
+                parquet_file.iter_batches(
+                    batch_size=self.sample_rows,
+                    row_groups=[0],
+                    columns=columns
+                ),
+                None
+            )
+            rows = []
+            if batch is not None:
+                for record in batch.to_pylist():
+                    rows.append(["" if record[name] is None else str(record[name]) for name in columns])
+            note = ""
+            if len(columns) < min(len(names), self.max_columns):
+                note = (
+                    f"Sample rows show the first {len(columns)} of {len(names)} columns "
+                    f"to stay under {format_size(self.max_bytes)} of column chunks."
+                )
+            self.rows_ready.emit((columns, rows, note))
+        except Exception as e:
+            if not self.reader.cancelled:
+                self.failed.emit(str(e))
+
+
+class TabularPreviewDialog(QDialog):
+    """Preview of Parquet and CSV/TSV objects that reads kilobytes, not the whole file"""
+
+    SAMPLE_ROWS = 200
+    MAX_SAMPLE_COLUMNS = 50
+    # Upper bound on the row group 0 column chunks fetched for sample rows
+    MAX_SAMPLE_BYTES = 32 * 1024 * 1024
+    CSV_CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, s3_client, bucket, key, size, file_format, version_id=None, parent=None):
+        super().__init__(parent)
+        self.reader = RangedObjectReader(s3_client, bucket, key, size, version_id)
+        self.file_format = file_format
+        self.csv_offset = 0
+        self.csv_leftover = b""
+        self.csv_dialect = None
+        self.has_header = True
+        self.sample_model = None
+        self.sample_worker = None
+
+        self.setWindowTitle(f"Preview: {os.path.basename(key)}")
+        self.resize(900, 600)
+        self.setup_ui()
+
+        try:
+            if file_format == 'parquet':
+                self.load_parquet()
+            else:
+                self.load_delimited()
+        except Exception as e:
+            self.summary_label.setText(f"Failed to preview file: {str(e)}")
+        self.update_transfer_status()
+
+    def setup_ui(self):
+        """Set up the user interface"""
+        layout = QVBoxLayout()
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        self.tabs = QTabWidget()
+        self.sample_view = self.add_table_tab("Sample Rows")
+        if self.file_format == 'parquet':
+            self.schema_view = self.add_table_tab("Schema")
+            self.row_group_view = self.add_table_tab("Row Groups")
+        layout.addWidget(self.tabs)
+
+        bottom_bar = QHBoxLayout()
+        self.transfer_label = QLabel()
+        bottom_bar.addWidget(self.transfer_label)
+        bottom_bar.addStretch()
+        self.more_button = QPushButton("Load More Rows")
+        self.more_button.clicked.connect(self.load_more_rows)
+        self.more_button.setVisible(self.file_format != 'parquet')
+        bottom_bar.addWidget(self.more_button)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        bottom_bar.addWidget(close_btn)
+        layout.addLayout(bottom_bar)
+
+        self.setLayout(layout)
+
+    def add_table_tab(self, title):
+        """Add a tab holding a virtualized table view"""
+        view = QTableView()
+        view.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.tabs.addTab(view, title)
+        return view
+
+    def update_transfer_status(self):
+        """Show how many bytes the preview has actually fetched"""
+        self.transfer_label.setText(
+            f"Read {format_size(self.reader.bytes_transferred)} of "
+            f"{format_size(self.reader.size)} in {self.reader.request_count} request(s)"
+        )
+
+    def load_parquet(self):
+        """Show schema and row-group statistics from the footer, then sample rows"""
+        metadata = read_parquet_footer(self.reader)
+        schema = metadata.get(2, [])
+        row_groups = metadata.get(4, [])
+
+        # Schema elements are a depth-first flattening of the tree; the
+        # first one is the root message
+        schema_rows = []
+        stack = []
+        for element in schema[1:]:
+            while stack and stack[-1] == 0:
+                stack.pop()
+            if stack:
+                stack[-1] -= 1
+            name = element.get(4, b"").decode('utf-8', errors='replace')
+            if 1 in element:
+                type_name = name_from(PHYSICAL_TYPES, element[1])
+            else:
+                type_name = "group"
+            logical = element.get(10)
+            if logical:
+                logical_name = name_from(LOGICAL_TYPES, next(iter(logical)))
+            elif 6 in element:
+                logical_name = name_from(CONVERTED_TYPES, element[6])
+            else:
+                logical_name = ""
+            schema_rows.append([
+                "    " * len(stack) + name,
+                type_name,
+                logical_name,
+                name_from(REPETITION_TYPES, element.get(3, 0)),
+            ])
+            if element.get(5):
+                stack.append(element[5])
+        self.schema_view.setModel(RowTableModel(
+            ["Column", "Physical Type", "Logical Type", "Repetition"], schema_rows, self
+        ))
+
+        row_group_rows = []
+        for index, row_group in enumerate(row_groups):
+            for column in row_group.get(1, []):
+                column_meta = column.get(3, {})
+                statistics = column_meta.get(12, {})
+                physical_type = column_meta.get(1)
+                row_group_rows.append([
+                    str(index),
+                    ".".join(part.decode('utf-8', errors='replace') for part in column_meta.get(3, [])),
+                    str(row_group.get(3, "")),
+                    format_size(column_meta.get(7, 0)),
+                    format_size(column_meta.get(6, 0)),
+                    name_from(CODECS, column_meta.get(4, 0)),
+                    format_statistic(statistics.get(6, statistics.get(2)), physical_type),
+                    format_statistic(statistics.get(5, statistics.get(1)), physical_type),
+                    str(statistics.get(3, "")),
+                ])
+        self.row_group_view.setModel(RowTableModel(
+            ["Row Group", "Column", "Rows", "Compressed", "Uncompressed", "Codec",
+             "Min", "Max", "Nulls"],
+            row_group_rows,
+            self
+        ))
+
+        leaf_count = sum(1 for element in schema[1:] if not element.get(5))
+        summary = (
+            f"{metadata.get(3, 0)} rows in {len(row_groups)} row group(s), "
+            f"{leaf_count} column(s)"
+        )
+        created_by = metadata.get(6)
+        if created_by:
+            summary += f", written by {created_by.decode('utf-8', errors='replace')}"
+        self.summary_label.setText(summary + ".")
+
+        if pq is None:
+            self.sample_view.setModel(RowTableModel(
+                ["Info"],
+                [["Install pyarrow (pip install pyarrow) to see sample rows."]],
+                self
+            ))
+            self.tabs.setCurrentWidget(self.schema_view)
+            return
+
+        if not row_groups:
+            return
+
+        # pyarrow fetches whole column chunks, which can be hundreds of MB,
+        # so sample rows are read in the background under a size cap
+        self.sample_view.setModel(RowTableModel(["Info"], [["Loading sample rows..."]], self))
+        self.sample_worker = ParquetSampleWorker(
+            self.reader,
+            self.SAMPLE_ROWS,
+            self.MAX_SAMPLE_COLUMNS,
+            self.MAX_SAMPLE_BYTES
+        )
+        self.sample_worker.rows_ready.connect(self.on_sample_rows)
+        self.sample_worker.failed.connect(self.on_sample_failed)
+        self.sample_worker.start()
+
+    def on_sample_rows(self, result):
+        """Show the sample rows read in the background"""
+        columns, rows, note = result
+        if columns:
+            self.sample_view.setModel(RowTableModel(columns, rows, self))
+        else:
+            self.sample_view.setModel(RowTableModel(["Info"], [[note]], self))
+        if note:
+            self.summary_label.setText(self.summary_label.text() + " " + note)
+        self.update_transfer_status()
+
+    def on_sample_failed(self, message):
+        """Report a failed sample read"""
+        self.sample_view.setModel(RowTableModel(["Info"], [[f"Failed to read sample rows: {message}"]], self))
+        self.update_transfer_status()
+
+    def load_delimited(self):
+        """Read the first chunk of a CSV/TSV object and infer its columns"""
+        rows = self.read_delimited_chunk()
+        if not rows:
+            self.sample_model = RowTableModel([], [], self)
+        else:
+            headers = rows[0]
+            if not self.has_header:
+                headers = [f"Column {i + 1}" for i in range(len(rows[0]))]
+            else:
+                rows = rows[1:]
+            self.sample_model = RowTableModel(headers, rows, self)
+        self.sample_view.setModel(self.sample_model)
+        self.update_csv_summary()
+
+    def load_more_rows(self):
+        """Append the rows from the next chunk"""
+        try:
+            self.sample_model.append_rows(self.read_delimited_chunk())
+        except Exception as e:
+            self.summary_label.setText(f"Failed to read more rows: {str(e)}")
+            return
+        self.update_csv_summary()
+        self.update_transfer_status()
+
+    def read_delimited_chunk(self):
+        """Parse the complete lines available after reading the next chunk"""
+        chunk_end = min(self.csv_offset + self.CSV_CHUNK_SIZE, self.reader.size)
+        data = self.csv_leftover + self.reader.read_range(self.csv_offset, chunk_end)
+        self.csv_offset = chunk_end
+
+        # Hold back a trailing partial line until the next chunk arrives
+        if self.csv_offset < self.reader.size:
+            last_newline = data.rfind(b"\n")
+            if last_newline == -1:
+                self.csv_leftover = data
+                return []
+            self.csv_leftover = data[last_newline + 1:]
+            data = data[:last_newline + 1]
+        else:
+            self.csv_leftover = b""
+
+        text = data.decode('utf-8', errors='replace')
+        if self.csv_dialect is None:
+            sniffer = csv.Sniffer()
+            sample = text[:64 * 1024]
+            if self.file_format == 'tsv':
+                self.csv_dialect = csv.excel_tab
+            else:
+                try:
+                    self.csv_dialect = sniffer.sniff(sample, delimiters=",;|\t")
+                except csv.Error:
+                    self.csv_dialect = csv.excel
+            try:
+                self.has_header = sniffer.has_header(sample)
+            except csv.Error:
+                self.has_header = True
+
+        return list(csv.reader(io.StringIO(text), self.csv_dialect))
+
+    def done(self, result):
+        """Stop the background sample read however the dialog is closed"""
+        if self.sample_worker:
+            self.reader.cancel()
+            self.sample_worker.wait()
+            self.sample_worker = None
+        super().done(result)
+
+    def update_csv_summary(self):
+        """Describe what has been loaded so far"""
+        finished = self.csv_offset >= self.reader.size
+        self.more_button.setEnabled(not finished)
+        self.summary_label.setText(
+            f"{self.sample_model.rowCount()} rows, {self.sample_model.columnCount()} columns"
+            + (" (whole file loaded)." if finished else " from the start of the file.")
+        )
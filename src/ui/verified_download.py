@@ -0,0 +1,329 @@
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import zlib
+
+try:
+    from awscrt import checksums as crt_checksums
+except ImportError:  # CRC32C/CRC64NVME verification is optional
+    crt_checksums = None
+
+
+# S3 additional checksum fields, in order of preference
+CHECKSUM_ALGORITHMS = ['SHA256', 'SHA1', 'CRC32C', 'CRC64NVME', 'CRC32']
+CHUNK_SIZE = 1024 * 1024
+# Objects hashed as one stream are still fetched as concurrent ranges of this size
+RANGE_SIZE = 8 * 1024 * 1024
+
+
+def current_umask():
+    """Return the process umask (it can only be read by setting it)"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import, before transfer threads exist, since reading it
+# briefly changes it for the whole process
+UMASK = current_umask()
+
+
+class ChecksumMismatchError(Exception):
+    """Raised when downloaded bytes do not match the object's checksums"""
+
+
+class CrcHasher:
+    """hashlib-style wrapper around an incremental CRC function"""
+
+    def __init__(self, crc_function, digest_size):
+        self.crc_function = crc_function
+        self.digest_size = digest_size
+        self.crc = 0
+
+    def update(self, data):
+        self.crc = self.crc_function(data, self.crc)
+
+    def digest(self):
+        return self.crc.to_bytes(self.digest_size, 'big')
+
+
+def new_hasher(algorithm):
+    """Create a hasher for an S3 checksum algorithm, or None if unavailable"""
+    if algorithm == 'MD5':
+        return hashlib.md5()
+    if algorithm == 'SHA1':
+        return hashlib.sha1()
+    if algorithm == 'SHA256':
+        return hashlib.sha256()
+    if algorithm == 'CRC32':
+        return CrcHasher(zlib.crc32, 4)
+    if algorithm == 'CRC32C' and crt_checksums:
+        return CrcHasher(crt_checksums.crc32c, 4)
+    if algorithm == 'CRC64NVME' and getattr(crt_checksums, 'crc64nvme', None):
+        return CrcHasher(crt_checksums.crc64nvme, 8)
+    return None
+
+
+class OrderedHasher:
+    """Hashes concurrently downloaded byte ranges in file order
+
+    The range whose turn it is gets hashed as it streams in; later ranges
+    are buffered until every range before them has been hashed. Workers
+    run ranges in submission order, so at most one buffered range is held
+    per worker.
+    """
+
+    def __init__(self, hashers):
+        self.hashers = hashers
+        self.next_index = 0
+        self.pending = {}
+        self.aborted = False
+        self.condition = threading.Condition()
+
+    def flush(self, index):
+        for data in self.pending.pop(index, []):
+            for hasher in self.hashers:
+                hasher.update(data)
+
+    def update(self, index, data):
+        """Hash data from range index now, or buffer it until its turn"""
+        with self.condition:
+            if index == self.next_index:
+                self.flush(index)
+                for hasher in self.hashers:
+                    hasher.update(data)
+            else:
+                self.pending.setdefault(index, []).append(data)
+
+    def finish(self, index):
+        """Wait for the ranges before this one, then hash what is left of it"""
+        with self.condition:
+            while self.next_index != index:
+                if self.aborted:
+                    raise RuntimeError("An earlier range failed")
+                self.condition.wait()
+            self.flush(index)
+            self.next_index += 1
+            self.condition.notify_all()
+
+    def abort(self):
+        """Release waiting workers after a range failed"""
+        with self.condition:
+            self.aborted = True
+            self.condition.notify_all()
+
+
+def plan_parts(s3_client, bucket, key, size, etag, extra_args):
+    """Split the object along its upload part boundaries
+
+    Multipart ETags are the MD5 of the per-part MD5s, so bytes must be
+    hashed per original part. The part size is read from the first part.
+    """
+    if '-' not in etag:
+        return [(0, size - 1)]
+
+    part_count = int(etag.rsplit('-', 1)[1])
+    part_size = s3_client.head_object(
+        Bucket=bucket, Key=key, PartNumber=1, **extra_args
+    )['ContentLength']
+    parts = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    if len(parts) != part_count:
+        # Parts were not uniform; we can still download, just not per part
+        return None
+    return parts
+
+
+def download_range(s3_client, bucket, key, etag, path, start, end, extra_args, on_data):
+    """Download one byte range into place, passing each chunk to on_data as it is written"""
+    if end < start:
+        return
+
+    response = s3_client.get_object(
+        Bucket=bucket,
+        Key=key,
+        Range=f"bytes={start}-{end}",
+        IfMatch=f'"{etag}"',  # Fail rather than mix bytes from a replaced object
+        **extra_args
+    )
+    with open(path, 'r+b') as f:
+        f.seek(start)
+        for chunk in response['Body'].iter_chunks(CHUNK_SIZE):
+            f.write(chunk)
+            on_data(chunk)
+
+
+def download_part(s3_client, bucket, key, etag, path, start, end, algorithm, extra_args):
+    """Download one upload part, returning its own MD5 and checksum digests"""
+    md5 = hashlib.md5()
+    checksum = new_hasher(algorithm) if algorithm else None
+
+    def on_data(chunk):
+        md5.update(chunk)
+        if checksum:
+            checksum.update(chunk)
+
+    download_range(s3_client, bucket, key, etag, path, start, end, extra_args, on_data)
+    return md5.digest(), checksum.digest() if checksum else None
+
+
+def download_ordered_range(s3_client, bucket, key, etag, path, start, end, extra_args,
+                           hasher, index):
+    """Download one range of an object that is hashed as a single stream"""
+    if hasher.aborted:
+        return  # No point fetching bytes that can no longer be verified
+    try:
+        download_range(
+            s3_client, bucket, key, etag, path, start, end, extra_args,
+            lambda chunk: hasher.update(index, chunk)
+        )
+        hasher.finish(index)
+    except Exception:
+        hasher.abort()
+        raise
+
+
+def collect_results(futures):
+    """Return the futures' results in order, cancelling the rest on the first error"""
+    try:
+        return [future.result() for future in futures]
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def download_stream(s3_client, bucket, key, etag, path, size, algorithm, extra_args, executor):
+    """Download a whole object as concurrent ranges, hashing it in order
+
+    Returns a single (MD5, checksum) digest pair for the whole object.
+    """
+    md5 = hashlib.md5()
+    checksum = new_hasher(algorithm) if algorithm else None
+    hasher = OrderedHasher([md5, checksum] if checksum else [md5])
+    futures = [
+        executor.submit(
+            download_ordered_range,
+            s3_client, bucket, key, etag, path,
+            start, min(start + RANGE_SIZE, size) - 1, extra_args, hasher, index
+        )
+        for index, start in enumerate(range(0, size, RANGE_SIZE))
+    ]
+    # The first failure is always the earliest range; later ones only abort
+    collect_results(futures)
+    return md5.digest(), checksum.digest() if checksum else None
+
+
+def download_verified(s3_client, bucket, key, path, version_id=None, max_workers=8, retries=1):
+    """Download an object and verify it against its ETag and S3 checksums
+
+    Hashing happens inside the transfer workers while bytes are written, so
+    verification needs no second read of the file. Bytes go to a temporary
+    file next to path, which only replaces path once verification passed.
+    Returns the names of the checks that passed (empty if the object
+    carries nothing verifiable). Raises ChecksumMismatchError if the data
+    still does not match after the given number of retries.
+    """
+    extra_args = {'VersionId': version_id} if version_id else {}
+    head = s3_client.head_object(Bucket=bucket, Key=key, ChecksumMode='ENABLED', **extra_args)
+    size = head['ContentLength']
+    etag = head['ETag'].strip('"')
+
+    # ETags of SSE-KMS and SSE-C objects are not MD5s of the content
+    etag_is_md5 = (
+        head.get('ServerSideEncryption') not in ('aws:kms', 'aws:kms:dsse')
+        and not head.get('SSECustomerAlgorithm')
+    )
+
+    parts = plan_parts(s3_client, bucket, key, size, etag, extra_args)
+    per_part = parts is not None
+    if not per_part:
+        etag_is_md5 = False
+        parts = [(0, size - 1)]
+
+    # Composite checksums ("<base64>-<parts>") are built from per-part
+    # checksums; full-object ones can only be checked on a single stream
+    algorithm = None
+    expected_checksum = None
+    for candidate in CHECKSUM_ALGORITHMS:
+        value = head.get(f'Checksum{candidate}')
+        if not value or new_hasher(candidate) is None:
+            continue
+        if (per_part and '-' in value) or ('-' not in value and len(parts) == 1):
+            algorithm = candidate
+            expected_checksum = value
+            break
+
+    # Never leave a partial or unverified file at path, nor clobber an
+    # existing one before the new data has checked out
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".part"
+    )
+    os.close(fd)
+    try:
+        for _ in range(retries + 1):
+            with open(temp_path, 'wb') as f:
+                f.truncate(size)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                if len(parts) > 1:
+                    futures = [
+                        executor.submit(
+                            download_part,
+                            s3_client, bucket, key, etag, temp_path, start, end, algorithm, extra_args
+                        )
+                        for start, end in parts
+                    ]
+                    digests = collect_results(futures)
+                else:
+                    digests = [download_stream(
+                        s3_client, bucket, key, etag, temp_path, size, algorithm, extra_args, executor
+                    )]
+
+            verified = []
+            mismatches = []
+
+            if etag_is_md5:
+                if '-' in etag:
+                    combined = hashlib.md5(b"".join(md5 for md5, _ in digests))
+                    actual_etag = f"{combined.hexdigest()}-{len(digests)}"
+                else:
+                    actual_etag = digests[0][0].hex()
+                if actual_etag == etag:
+                    verified.append("ETag (MD5)")
+                else:
+                    mismatches.append(f"ETag expected {etag}, got {actual_etag}")
+
+            if algorithm:
+                if '-' in expected_checksum:
+                    combined = new_hasher(algorithm)
+                    combined.update(b"".join(checksum for _, checksum in digests))
+                    actual_checksum = f"{base64.b64encode(combined.digest()).decode()}-{len(digests)}"
+                else:
+                    actual_checksum = base64.b64encode(digests[0][1]).decode()
+                if actual_checksum == expected_checksum:
+                    verified.append(algorithm)
+                else:
+                    mismatches.append(f"{algorithm} expected {expected_checksum}, got {actual_checksum}")
+
+            if not mismatches:
+                # mkstemp creates files as 0600; give the download the mode a
+                # normally created file (or the one it replaces) would have
+                try:
+                    mode = stat.S_IMODE(os.stat(path).st_mode)
+                except FileNotFoundError:
+                    mode = 0o666 & ~UMASK
+                os.chmod(temp_path, mode)
+                os.replace(temp_path, path)
+                return verified
+    finally:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass  # Already moved into place
+
+    raise ChecksumMismatchError(f"{key}: " + "; ".join(mismatches))
@@ -0,0 +1,456 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                             QPushButton, QTreeWidget, QTreeWidgetItem,
+                             QHeaderView, QMenu, QMessageBox)
+from PyQt6.QtCore import pyqtSignal, Qt, QThread
+from .formatting import format_size
+
+
+def merge_versions(response):
+    """Combine a list_object_versions page into one key-ordered list
+
+    Versions and delete markers come back in separate arrays; within a key
+    they are ordered newest first.
+    """
+    entries = [
+        dict(version, is_delete_marker=False)
+        for version in response.get('Versions', [])
+    ] + [
+        dict(marker, is_delete_marker=True, Size=0)
+        for marker in response.get('DeleteMarkers', [])
+    ]
+    entries.sort(key=lambda entry: (entry['Key'], -entry['LastModified'].timestamp()))
+    return entries
+
+
+def version_object(entry):
+    """Turn a version entry into the object dict used by preview and download"""
+    return {
+        'Key': entry['Key'],
+        'Size': entry.get('Size', 0),
+        'LastModified': entry['LastModified'],
+        'ContentType': 'N/A',
+        'ETag': entry.get('ETag'),
+        'is_folder': False,
+        'VersionId': entry['VersionId'],
+    }
+
+
+class VersionPageWorker(QThread):
+    """Fetches one page of the delimited version listing"""
+
+    page_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    PAGE_SIZE = 1000
+
+    def __init__(self, generation, s3_client, bucket, prefix, markers=None):
+        super().__init__()
+        self.generation = generation
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.markers = markers
+
+    def run(self):
+        params = {
+            'Bucket': self.bucket,
+            'Prefix': self.prefix,
+            'Delimiter': '/',
+            'MaxKeys': self.PAGE_SIZE,
+        }
+        if self.markers:
+            key_marker, version_id_marker = self.markers
+            params['KeyMarker'] = key_marker
+            if version_id_marker:
+                params['VersionIdMarker'] = version_id_marker
+        try:
+            self.page_ready.emit(self.s3_client.list_object_versions(**params))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class KeyVersionsWorker(QThread):
+    """Lists every version of a single key, stopping once the listing passes it"""
+
+    versions_ready = pyqtSignal(object)  # (entries, truncated)
+    failed = pyqtSignal(str)
+
+    MAX_VERSIONS = 1000
+
+    def __init__(self, generation, s3_client, bucket, key):
+        super().__init__()
+        self.generation = generation
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+
+    def run(self):
+        params = {'Bucket': self.bucket, 'Prefix': self.key, 'MaxKeys': self.MAX_VERSIONS}
+        entries = []
+        truncated = False
+        try:
+            while True:
+                response = self.s3_client.list_object_versions(**params)
+                page = merge_versions(response)
+                entries.extend(entry for entry in page if entry['Key'] == self.key)
+
+                # Keys sharing this key as a prefix sort after it
+                passed_key = any(entry['Key'] > self.key for entry in page)
+                if passed_key or not response.get('IsTruncated'):
+                    break
+                if len(entries) >= self.MAX_VERSIONS:
+                    truncated = True  # More versions of this key may follow
+                    break
+                params['KeyMarker'] = response['NextKeyMarker']
+                params['VersionIdMarker'] = response['NextVersionIdMarker']
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        truncated = truncated or len(entries) > self.MAX_VERSIONS
+        self.versions_ready.emit((entries[:self.MAX_VERSIONS], truncated))
+
+
+class NoncurrentBytesWorker(QThread):
+    """Sums non-current version sizes under a prefix, grouped by direct child
+
+    Each page's totals are emitted as a delta so the UI can keep a running
+    sum without the worker ever re-sending what it has already reported.
+    """
+
+    progress = pyqtSignal(object)  # (per-child byte deltas, versions, bytes)
+    scan_finished = pyqtSignal()
+    failed = pyqtSignal(str)
+
+    def __init__(self, generation, s3_client, bucket, prefix):
+        super().__init__()
+        self.generation = generation
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cancelled = False
+
+    def cancel(self):
+        """Stop after the current page"""
+        self.cancelled = True
+
+    def run(self):
+        try:
+            paginator = self.s3_client.get_paginator('list_object_versions')
+            for response in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+                if self.cancelled:
+                    return
+                deltas = {}
+                versions = 0
+                total = 0
+                for version in response.get('Versions', []):
+                    if version['IsLatest']:
+                        continue
+                    relative = version['Key'][len(self.prefix):]
+                    if '/' in relative:
+                        child = self.prefix + relative.split('/', 1)[0] + '/'
+                    else:
+                        child = version['Key']
+                    deltas[child] = deltas.get(child, 0) + version['Size']
+                    versions += 1
+                    total += version['Size']
+                self.progress.emit((deltas, versions, total))
+            self.scan_finished.emit()
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
+
+
+class VersionBrowser(QWidget):
+    """Lazy tree of keys and their versions for the explorer's versions mode"""
+
+    folder_opened = pyqtSignal(str)
+    preview_requested = pyqtSignal(object)
+    download_requested = pyqtSignal(object)
+
+    NAME, SIZE, MODIFIED, STATUS, VERSIONS, NONCURRENT = range(6)
+    # Item data roles on the Name column; items themselves are not hashable
+    KEY_ROLE = Qt.ItemDataRole.UserRole
+    ENTRY_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.s3_client = None
+        self.bucket = None
+        self.prefix = ""
+        self.list_prefix = ""
+        self.generation = 0  # Bumped on every reset; older workers are ignored
+        self.workers = set()
+        self.aggregate_worker = None
+        self.next_markers = None
+        self.key_items = {}
+        self.version_counts = {}
+        self.loaded_keys = set()
+        self.noncurrent_bytes = {}
+        self.noncurrent_total = 0
+        self.noncurrent_versions = 0
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Set up the user interface"""
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(6)
+        self.tree.setHeaderLabels(
+            ["Name", "Size", "Last Modified", "Status", "Versions", "Non-current Size"]
+        )
+        self.tree.header().setSectionResizeMode(self.NAME, QHeaderView.ResizeMode.Stretch)
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self.show_context_menu)
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+        self.tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        layout.addWidget(self.tree)
+
+        bottom_bar = QHBoxLayout()
+        self.status_label = QLabel()
+        bottom_bar.addWidget(self.status_label)
+        bottom_bar.addStretch()
+        self.noncurrent_label = QLabel()
+        bottom_bar.addWidget(self.noncurrent_label)
+        self.more_button = QPushButton("Load More")
+        self.more_button.clicked.connect(self.load_next_page)
+        bottom_bar.addWidget(self.more_button)
+        reload_button = QPushButton("Reload")
+        reload_button.clicked.connect(self.reload)
+        bottom_bar.addWidget(reload_button)
+        layout.addLayout(bottom_bar)
+
+        self.setLayout(layout)
+
+    def set_location(self, s3_client, bucket, prefix, name_prefix=""):
+        """Show versions under a folder, optionally narrowed by a name prefix"""
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.list_prefix = prefix + name_prefix
+        self.reload()
+
+    def reload(self):
+        """Discard everything shown and start listing from the beginning"""
+        self.stop()
+        self.generation += 1
+        self.tree.clear()
+        self.next_markers = None
+        self.key_items = {}
+        self.version_counts = {}
+        self.loaded_keys = set()
+        self.noncurrent_bytes = {}
+        self.noncurrent_total = 0
+        self.noncurrent_versions = 0
+        if not self.bucket:
+            return
+
+        self.load_next_page()
+
+        # Non-current bytes are aggregated over the whole prefix in the
+        # background while the first page is browsed
+        worker = NoncurrentBytesWorker(self.generation, self.s3_client, self.bucket, self.list_prefix)
+        worker.progress.connect(lambda progress, w=worker: self.on_noncurrent_progress(w, progress))
+        worker.scan_finished.connect(lambda w=worker: self.on_noncurrent_finished(w))
+        worker.failed.connect(lambda message, w=worker: self.on_noncurrent_failed(w, message))
+        self.aggregate_worker = worker
+        self.start_worker(worker)
+        self.update_noncurrent_label(scanning=True)
+
+    def stop(self):
+        """Stop the background aggregation; other workers finish on their own"""
+        if self.aggregate_worker:
+            self.aggregate_worker.cancel()
+            self.aggregate_worker = None
+
+    def start_worker(self, worker):
+        """Start a worker, keeping a reference until its thread exits"""
+        self.workers.add(worker)
+        worker.finished.connect(lambda w=worker: self.workers.discard(w))
+        worker.start()
+
+    def load_next_page(self):
+        """Fetch the next page of the version listing"""
+        self.more_button.setEnabled(False)
+        self.status_label.setText("Loading versions...")
+        worker = VersionPageWorker(
+            self.generation,
+            self.s3_client,
+            self.bucket,
+            self.list_prefix,
+            self.next_markers
+        )
+        worker.page_ready.connect(lambda response, w=worker: self.on_page_ready(w, response))
+        worker.failed.connect(lambda message, w=worker: self.on_failed(w, message))
+        self.start_worker(worker)
+
+    def on_page_ready(self, worker, response):
+        """Add the folders, keys and versions from a listing page"""
+        if worker.generation != self.generation:
+            return
+
+        for common_prefix in response.get('CommonPrefixes', []):
+            folder = common_prefix['Prefix']
+            if folder not in self.key_items:
+                item = QTreeWidgetItem(["📁 " + folder[len(self.prefix):].rstrip('/'), "", "", "folder", "", ""])
+                self.add_top_level_item(folder, item)
+
+        for entry in merge_versions(response):
+            key = entry['Key']
+            item = self.key_items.get(key)
+            if item is None:
+                item = QTreeWidgetItem(["📄 " + key[len(self.prefix):], "", "", "", "", ""])
+                item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                self.add_top_level_item(key, item)
+            if entry['IsLatest']:
+                item.setData(self.NAME, self.ENTRY_ROLE, entry)
+                self.fill_version_columns(item, entry)
+                item.setText(self.NAME, ("🗑 " if entry['is_delete_marker'] else "📄 ") + key[len(self.prefix):])
+            self.version_counts[key] = self.version_counts.get(key, 0) + 1
+            item.setText(self.VERSIONS, str(self.version_counts[key]))
+
+        if response.get('IsTruncated'):
+            self.next_markers = (response.get('NextKeyMarker'), response.get('NextVersionIdMarker'))
+        else:
+            self.next_markers = None
+        self.more_button.setEnabled(self.next_markers is not None)
+        self.status_label.setText(
+            f"{len(self.key_items)} entries loaded"
+            + (", more available" if self.next_markers else "")
+        )
+
+    def add_top_level_item(self, key, item):
+        """Add a folder or key row, filling in any non-current total already known"""
+        self.key_items[key] = item
+        item.setData(self.NAME, self.KEY_ROLE, key)
+        if key in self.noncurrent_bytes:
+            item.setText(self.NONCURRENT, format_size(self.noncurrent_bytes[key]))
+        self.tree.addTopLevelItem(item)
+
+    def fill_version_columns(self, item, entry):
+        """Show size, date and status of a version on a row"""
+        if entry['is_delete_marker']:
+            status = "deleted" if entry['IsLatest'] else "delete marker"
+            item.setText(self.SIZE, "")
+        else:
+            status = "current" if entry['IsLatest'] else "non-current"
+            item.setText(self.SIZE, format_size(entry.get('Size', 0)))
+        item.setText(self.MODIFIED, entry['LastModified'].strftime('%Y-%m-%d %H:%M:%S'))
+        item.setText(self.STATUS, status)
+
+    def on_item_expanded(self, item):
+        """Load a key's versions the first time it is expanded"""
+        if item.parent() is not None:
+            return
+        key = item.data(self.NAME, self.KEY_ROLE)
+        if key is None or key.endswith('/') or key in self.loaded_keys:
+            return
+
+        self.loaded_keys.add(key)
+        item.addChild(QTreeWidgetItem(["Loading versions..."]))
+        worker = KeyVersionsWorker(self.generation, self.s3_client, self.bucket, key)
+        worker.versions_ready.connect(lambda result, w=worker, i=item: self.on_key_versions(w, i, result))
+        worker.failed.connect(
+            lambda message, w=worker, i=item, k=key: self.on_key_versions_failed(w, i, k, message)
+        )
+        self.start_worker(worker)
+
+    def on_key_versions_failed(self, worker, item, key, message):
+        """Drop the placeholder so expanding the key again retries"""
+        if worker.generation != self.generation:
+            return
+        self.loaded_keys.discard(key)
+        item.takeChildren()
+        item.setExpanded(False)
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to list versions of this object: {message}"
+        )
+
+    def on_key_versions(self, worker, item, result):
+        """Replace the placeholder with one child per version"""
+        if worker.generation != self.generation:
+            return
+        entries, truncated = result
+        item.takeChildren()
+        for entry in entries:
+            label = entry['VersionId'] + (" (latest)" if entry['IsLatest'] else "")
+            child = QTreeWidgetItem([label, "", "", "", "", ""])
+            self.fill_version_columns(child, entry)
+            child.setData(self.NAME, self.ENTRY_ROLE, entry)
+            item.addChild(child)
+        if truncated:
+            item.addChild(QTreeWidgetItem([f"Only the newest {len(entries)} versions are shown"]))
+
+    def on_noncurrent_progress(self, worker, progress):
+        """Fold a page of non-current totals into the tree"""
+        if worker is not self.aggregate_worker:
+            return
+        deltas, versions, total = progress
+        for child, size in deltas.items():
+            self.noncurrent_bytes[child] = self.noncurrent_bytes.get(child, 0) + size
+            item = self.key_items.get(child)
+            if item is not None:
+                item.setText(self.NONCURRENT, format_size(self.noncurrent_bytes[child]))
+        self.noncurrent_versions += versions
+        self.noncurrent_total += total
+        self.update_noncurrent_label(scanning=True)
+
+    def on_noncurrent_finished(self, worker):
+        if worker is not self.aggregate_worker:
+            return
+        self.aggregate_worker = None
+        self.update_noncurrent_label(scanning=False)
+
+    def on_noncurrent_failed(self, worker, message):
+        if worker is not self.aggregate_worker:
+            return
+        self.aggregate_worker = None
+        self.noncurrent_label.setText(f"Non-current scan failed: {message}")
+
+    def update_noncurrent_label(self, scanning):
+        """Summarize non-current versions under this prefix"""
+        self.noncurrent_label.setText(
+            f"Non-current: {self.noncurrent_versions} versions, "
+            f"{format_size(self.noncurrent_total)}"
+            + (" (scanning...)" if scanning else "")
+        )
+
+    def on_failed(self, worker, message):
+        """Report a failed listing"""
+        if worker.generation != self.generation:
+            return
+        self.more_button.setEnabled(self.next_markers is not None)
+        self.status_label.setText("")
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"Failed to list object versions: {message}"
+        )
+
+    def on_item_double_clicked(self, item, column):
+        """Open folders and preview versions"""
+        key = item.data(self.NAME, self.KEY_ROLE)
+        if key is not None and key.endswith('/'):
+            self.folder_opened.emit(key)
+            return
+        entry = item.data(self.NAME, self.ENTRY_ROLE)
+        if entry and not entry['is_delete_marker'] and item.parent() is not None:
+            self.preview_requested.emit(version_object(entry))
+
+    def show_context_menu(self, position):
+        """Offer preview and download of the clicked version"""
+        item = self.tree.itemAt(position)
+        entry = item.data(self.NAME, self.ENTRY_ROLE) if item else None
+        if not entry or entry['is_delete_marker']:
+            return
+
+        menu = QMenu()
+        preview_action = menu.addAction("Preview Version")
+        preview_action.triggered.connect(lambda: self.preview_requested.emit(version_object(entry)))
+        download_action = menu.addAction("Download Version")
+        download_action.triggered.connect(lambda: self.download_requested.emit(version_object(entry)))
+        menu.exec(self.tree.viewport().mapToGlobal(position))